@@ -60,6 +60,14 @@ class QuickUnion(Connectivity):
 
         return i
 
+    def get_root(self, element):
+        """
+        Id of component the element belongs to
+        :param element: index of element
+        :return: int
+        """
+        return self._get_root(element)
+
     def union(self, element, to_element):
         element_root = self._get_root(element)
         to_element_root = self._get_root(to_element)
@@ -89,6 +97,40 @@ class QuickUnionWeighted(QuickUnion):
             self.size_array[element_root] += self.size_array[to_element_root]
 
 
+class QuickUnionRanked(QuickUnion):
+    """
+    Union by rank with path compression (path halving): every find makes the path to the root twice shorter,
+    so any sequence of operations takes almost linear time.
+    """
+    def __init__(self, length):
+        super().__init__(length)
+        self.rank = [0 for _ in range(length)]
+
+    def _get_root(self, i):
+        data = self.data
+
+        while i != data[i]:
+            data[i] = data[data[i]]
+            i = data[i]
+
+        return i
+
+    def union(self, element, to_element):
+        element_root = self._get_root(element)
+        to_element_root = self._get_root(to_element)
+
+        if element_root == to_element_root:
+            return
+
+        if self.rank[element_root] < self.rank[to_element_root]:
+            self.data[element_root] = to_element_root
+        elif self.rank[element_root] > self.rank[to_element_root]:
+            self.data[to_element_root] = element_root
+        else:
+            self.data[to_element_root] = element_root
+            self.rank[element_root] += 1
+
+
 if __name__ == "__main__":
     def connectivity_scenario(find_object):
         print('--- ' * 20)
@@ -116,3 +158,4 @@ if __name__ == "__main__":
     connectivity_scenario(find_object=QuickFind(length=10))
     connectivity_scenario(find_object=QuickUnion(length=10))
     connectivity_scenario(find_object=QuickUnionWeighted(length=10))
+    connectivity_scenario(find_object=QuickUnionRanked(length=10))
@@ -94,6 +94,16 @@ class PriorityQueue:
         """
         return self.queue_size
 
+    def get_top_priority(self):
+        """
+        Get priority of the item which is next to pop
+        :return: float
+        """
+        if self.queue_size == 0:
+            return
+
+        return self.queue[1].weight
+
     def is_empty(self):
         """
         Check if queue is empty
@@ -218,28 +228,46 @@ class MinPriorityQueue(PriorityQueue):
 
 
 class IndexMinPriorityQueue(MinPriorityQueue):
+    """
+    Min priority queue with access to items which are already in the queue.
+    Every item in the queue occupies a slot:
+        items[slot] - the item itself
+        item_ids_in_queue[slot] - position of the item in the heap
+        item_slots[item] - slot of the item
+    So check if item is in queue is O(1), change of priority and removal of any item are O(log n).
+    Slots of removed items are reused. Items have to be hashable, integer ids of vertexes are common choice.
+    """
     def __init__(self):
         self.queue = []
         self.items = []
         self.item_ids_in_queue = []
+        self.item_slots = {}
+        self.free_slots = []
         self.queue.append(PriorityQueueItem(0, None))  # item with index 0 not used in this model
         self.queue_size = 0
 
     def add_to_queue(self, item: object, priority: float):
         """
         Add object to queue with given priority
-        :param item: Any object
+        :param item: Any hashable object
         :param priority: which priority this object has in the queue
         :return: None
         """
         if self._contains(item):
             raise ValueError('Item already in queue. Add another item or copy of current item.')
 
-        item_to_queue = PriorityQueueItem(weight=priority, item=len(self.items))
-        self.items.append(item)
-        self.queue.append(item_to_queue)
+        if self.free_slots:
+            slot = self.free_slots.pop()
+            self.items[slot] = item
+        else:
+            slot = len(self.items)
+            self.items.append(item)
+            self.item_ids_in_queue.append(None)
+
+        self.item_slots[item] = slot
+        self.queue.append(PriorityQueueItem(weight=priority, item=slot))
         self.queue_size += 1
-        self.item_ids_in_queue.append(self.queue_size)
+        self.item_ids_in_queue[slot] = self.queue_size
         self._swim(self.queue_size)
 
     def pop_min(self):
@@ -250,25 +278,63 @@ class IndexMinPriorityQueue(MinPriorityQueue):
         if self.queue_size == 0:
             return
 
-        self._exchange(1, self.queue_size)
-        item_id_to_return = self.queue.pop().item
-        item_to_return = self.items[item_id_to_return]
-        self.queue_size -= 1
-        self._sink(1)
-        self.items[item_id_to_return] = None
-        self.item_ids_in_queue[item_id_to_return] = None
-        return item_to_return
+        return self._remove_from_queue(1)
+
+    def get_priority(self, item: object):
+        """
+        Get priority of item in queue
+        :param item: item from queue
+        :return: float
+        """
+        if not self._contains(item):
+            raise ValueError('Item not in queue.')
+
+        return self.queue[self.item_ids_in_queue[self.item_slots[item]]].weight
 
     def update_priority(self, item: object, new_priority: float):
+        """
+        Change priority of item in queue
+        :param item: item from queue
+        :param new_priority: new priority of the item
+        :return: None
+        """
         if not self._contains(item):
             raise ValueError('Item not in queue. Update priority available only for items in queue.')
 
-        item_id = self.items.index(item)
-        item_id_in_queue = self.item_ids_in_queue[item_id]
+        item_id_in_queue = self.item_ids_in_queue[self.item_slots[item]]
         self.queue[item_id_in_queue].weight = new_priority
         self._sink(item_id_in_queue)
         self._swim(item_id_in_queue)
-        a=0
+
+    def delete(self, item: object):
+        """
+        Remove item from queue
+        :param item: item from queue
+        :return: None
+        """
+        if not self._contains(item):
+            raise ValueError('Item not in queue.')
+
+        self._remove_from_queue(self.item_ids_in_queue[self.item_slots[item]])
+
+    def contains(self, item: object):
+        return self._contains(item)
+
+    def _remove_from_queue(self, item_id_in_queue: int):
+        self._exchange(item_id_in_queue, self.queue_size)
+        slot = self.queue.pop().item
+        self.queue_size -= 1
+
+        if item_id_in_queue <= self.queue_size:
+            self._sink(item_id_in_queue)
+            self._swim(item_id_in_queue)
+
+        item = self.items[slot]
+        del self.item_slots[item]
+        self.items[slot] = None
+        self.item_ids_in_queue[slot] = None
+        self.free_slots.append(slot)
+        return item
 
     def _exchange(self, i: int, j: int):
         self.item_ids_in_queue[self.queue[j].item] = i
@@ -276,10 +342,9 @@ class IndexMinPriorityQueue(MinPriorityQueue):
         temp = self.queue[i]
         self.queue[i] = self.queue[j]
         self.queue[j] = temp
-        a = 0
 
     def _contains(self, item: object):
-        return item in self.items
+        return item in self.item_slots
 
 
 if __name__ == '__main__':
@@ -0,0 +1,249 @@
+import math
+import mmap
+import struct
+import sys
+from array import array
+
+from education_part.graphs import CSRGraph, dijkstra_distances, many_source_shortest_paths
+
+MAGIC = b'ALAP'
+VERSION = 1
+HEADER = struct.Struct('<4sIIq')  # magic, version, flags, vertexes number
+HEADER_SIZE = 64  # header is padded, so matrix starts from 8 bytes aligned position
+
+BIG_ENDIAN_FLAG = 1
+
+FLOYD_WARSHALL = 'floyd_warshall'
+DIJKSTRA = 'dijkstra'
+
+
+class AllPairsShortestPaths:
+    """
+    Distances between all pairs of vertexes in V x V matrix of float64, stored row by row in memory mapped file
+    (or anonymous memory map if path is not given), so matrix may be bigger than RAM and is read in place.
+    Two algorithms:
+        floyd_warshall - Floyd-Warshall for dense graphs with intermediate vertexes taken by groups of block_size.
+                         Rows of the group are relaxed through each other first, then every other row is copied
+                         from the map to list, relaxed through the whole group and written back, so the whole
+                         matrix is passed V / block_size times instead of V times. It is not cache blocking:
+                         every pass still copies every row
+        dijkstra - Dijkstra from every vertex for sparse graphs, optionally in pool of processes
+    By default algorithm is chosen by comparing V ** 3 with V * E * log(V).
+    """
+    def __init__(
+            self,
+            graph,
+            path: str = None,
+            algorithm: str = None,
+            block_size: int = 64,
+            processes: int = None,
+    ):
+        csr = CSRGraph.from_graph(graph)
+        self.vertexes_number = csr.vertexes_number
+        self.path = path
+        self.block_size = block_size
+        self.algorithm = algorithm or self._default_algorithm(csr)
+
+        if self.algorithm not in (FLOYD_WARSHALL, DIJKSTRA):
+            raise ValueError(f'Unknown algorithm: {self.algorithm}.')
+
+        self._map_matrix(writable=True)
+
+        if self.algorithm == FLOYD_WARSHALL:
+            self._floyd_warshall(csr)
+        else:
+            self._dijkstra(csr, processes)
+
+    @staticmethod
+    def _default_algorithm(csr: CSRGraph):
+        vertex_num = csr.vertexes_number
+
+        if vertex_num ** 3 < vertex_num * csr.edges_number * math.log2(vertex_num + 1):
+            return FLOYD_WARSHALL
+
+        return DIJKSTRA
+
+    def _map_matrix(self, writable: bool):
+        size = HEADER_SIZE + 8 * self.vertexes_number ** 2
+
+        if self.path is None:
+            self._buffer = mmap.mmap(-1, size)
+        elif writable:
+            with open(self.path, 'w+b') as file:
+                file.truncate(size)
+                self._buffer = mmap.mmap(file.fileno(), size)
+        else:
+            with open(self.path, 'rb') as file:
+                self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if writable:
+            flags = BIG_ENDIAN_FLAG if sys.byteorder == 'big' else 0
+            self._buffer[:HEADER.size] = HEADER.pack(MAGIC, VERSION, flags, self.vertexes_number)
+
+        self.matrix = memoryview(self._buffer)[HEADER_SIZE:size].cast('d')
+
+    def _floyd_warshall(self, csr: CSRGraph):
+        vertex_num = self.vertexes_number
+
+        for v_id in range(vertex_num):
+            row = array('d', [math.inf]) * vertex_num
+            row[v_id] = 0
+
+            for adj, weight in csr.weighted_adjacencies(v_id):
+                if weight < row[adj]:
+                    row[adj] = weight
+
+            self._write_row(v_id, row)
+
+        for block_start in range(0, vertex_num, self.block_size):
+            block = range(block_start, min(block_start + self.block_size, vertex_num))
+
+            # Floyd-Warshall over rows of the block only
+            block_rows = [list(self.matrix[k * vertex_num:(k + 1) * vertex_num]) for k in block]
+            for k_index, k in enumerate(block):
+                for i_index in range(len(block_rows)):
+                    block_rows[i_index] = _relax_row(block_rows[i_index], block_rows[k_index], k)
+
+            for k, row in zip(block, block_rows):
+                self._write_row(k, array('d', row))
+
+            # every other row is relaxed through all vertexes of the block
+            for v_id in range(vertex_num):
+                if v_id in block:
+                    continue
+
+                row = list(self.matrix[v_id * vertex_num:(v_id + 1) * vertex_num])
+                for k_index, k in enumerate(block):
+                    row = _relax_row(row, block_rows[k_index], k)
+
+                self._write_row(v_id, array('d', row))
+
+    def _dijkstra(self, csr: CSRGraph, processes: int):
+        if processes is None:
+            for v_id in range(self.vertexes_number):
+                self._write_row(v_id, dijkstra_distances(csr, v_id))
+            return
+
+        with many_source_shortest_paths(csr, range(self.vertexes_number), processes) as results:
+            for v_id, dist_to in results:
+                self._write_row(v_id, dist_to)
+
+    def _write_row(self, v_id: int, row: array):
+        self.matrix[v_id * self.vertexes_number:(v_id + 1) * self.vertexes_number] = row
+
+    def distance(self, v_id: int, w_id: int):
+        """
+        :return: length of the shortest path from v_id to w_id, math.inf if there is no path
+        """
+        return self.matrix[v_id * self.vertexes_number + w_id]
+
+    def distances_from(self, v_id: int):
+        """
+        Row is copied in one block, so it stays valid after close
+        :return: array of lengths of the shortest paths from v_id to every vertex
+        """
+        row = array('d')
+        row.frombytes(self.matrix[v_id * self.vertexes_number:(v_id + 1) * self.vertexes_number].cast('B'))
+        return row
+
+    def flush(self):
+        self._buffer.flush()
+
+    def close(self):
+        """
+        Unmap matrix. Views of matrix attribute taken by caller have to be released before.
+        """
+        self.matrix.release()
+        self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @classmethod
+    def load(cls, path):
+        """
+        Open matrix saved by AllPairsShortestPaths object created with path. File is mapped read only.
+        :param path: path to file
+        :return: AllPairsShortestPaths object
+        """
+        with open(path, 'rb') as file:
+            magic, version, flags, vertex_num = HEADER.unpack(file.read(HEADER.size))
+
+        if magic != MAGIC:
+            raise ValueError(f'File "{path}" is not a shortest paths matrix file.')
+        if version != VERSION:
+            raise ValueError(f'Unsupported shortest paths matrix file version: {version}.')
+        if bool(flags & BIG_ENDIAN_FLAG) != (sys.byteorder == 'big'):
+            raise ValueError('Shortest paths matrix file is saved with another byte order.')
+
+        apsp = cls.__new__(cls)
+        apsp.vertexes_number = vertex_num
+        apsp.path = path
+        apsp.block_size = None
+        apsp.algorithm = None
+        apsp._map_matrix(writable=False)
+        return apsp
+
+
+def _relax_row(row: list, k_row: list, k: int):
+    """
+    One step of Floyd-Warshall for one row: paths from row's vertex through vertex k
+    """
+    through_k = row[k]
+
+    if through_k == math.inf:
+        return row
+
+    return [dist if dist <= through_k + k_dist else through_k + k_dist for dist, k_dist in zip(row, k_row)]
+
+
+if __name__ == '__main__':
+    import os
+    import tempfile
+    import time
+    from random import randint, random
+
+    from education_part.graphs import edge_weight_digraph_from_data, EdgeWeightedDigraph, DijkstraShortestPath
+
+    g_data = [
+        '8', '0 1 5.0', '0 4 9.0', '0 7 8.0', '1 2 12.0', '1 3 15.0', '1 7 4.0', '2 3 3.0', '2 6 11.0',
+        '3 6 9.0', '4 5 4.0', '4 6 20.0', '4 7 5.0', '5 2 1.0', '5 6 13.0', '7 5 6.0', '7 2 7.0',
+    ]
+    g = edge_weight_digraph_from_data(g_data, EdgeWeightedDigraph)
+
+    with AllPairsShortestPaths(g, algorithm=FLOYD_WARSHALL, block_size=3) as apsp:
+        print(f'Distance 0 -> 6: {apsp.distance(0, 6)}')
+        print(f'Distances from 4: {list(apsp.distances_from(4))}')
+
+    print('\n--- Random graphs ---')
+    for size, degree in ((200, 50), (500, 3)):
+        big = EdgeWeightedDigraph(size)
+        big.add_edges(
+            [randint(0, size - 1) for _ in range(size * degree)],
+            [randint(0, size - 1) for _ in range(size * degree)],
+            [random() for _ in range(size * degree)],
+        )
+
+        start = time.time()
+        lists = [DijkstraShortestPath(big, vertex).dist_to for vertex in big.vertexes]
+        print(f'DijkstraShortestPath from every vertex of {size}, degree {degree}:'.ljust(60), end='')
+        print(f' {round(time.time() - start, 5)} seconds')
+
+        with tempfile.TemporaryDirectory() as directory:
+            for algorithm in (FLOYD_WARSHALL, DIJKSTRA):
+                matrix_path = os.path.join(directory, f'{algorithm}.bin')
+                start = time.time()
+                with AllPairsShortestPaths(big, path=matrix_path, algorithm=algorithm):
+                    pass
+                print(f'AllPairsShortestPaths, {algorithm}:'.ljust(60), f'{round(time.time() - start, 5)} seconds')
+
+                with AllPairsShortestPaths.load(matrix_path) as loaded:
+                    for v_id in range(0, size, 50):
+                        if any(abs(a - b) > 1e-9 for a, b in zip(loaded.distances_from(v_id), lists[v_id])):
+                            print('Distances are different!!!')
+                            break
+
+            print(f'Default algorithm: {AllPairsShortestPaths._default_algorithm(CSRGraph.from_graph(big))}')
@@ -0,0 +1,399 @@
+import math
+import struct
+import sys
+from array import array
+
+from education_part.data_structures import IndexMinPriorityQueue
+from education_part.graphs import EdgeWeightedDigraph, CSRGraph, vertex_ids_typecode, write_array, read_array
+
+MAGIC = b'ALCH'
+VERSION = 2
+# magic, version, flags, vertexes number, upward edges number, downward edges number, shortcuts number
+HEADER = struct.Struct('<4sIIqqqq')
+
+BIG_ENDIAN_FLAG = 1
+
+
+class ContractionHierarchy:
+    """
+    Contraction hierarchies for static EdgeWeightedDigraph.
+    Preprocessing contracts vertexes one by one in order of their importance (edge difference + number of
+    contracted neighbours). Contraction of vertex adds shortcut from each its predecessor to each its successor,
+    unless witness search finds path which is not longer and goes around the vertex.
+    After preprocessing every vertex has rank (order of contraction) and two searchable graphs:
+        upward - edges to higher ranked vertexes, used by search from source
+        downward - reversed edges from higher ranked vertexes, used by search from destination
+    Query is bidirectional Dijkstra over these graphs, it settles only small part of vertexes.
+    Middle vertex of every edge (-1 for original edges) is kept to unpack shortcuts into full paths.
+    """
+    def __init__(self, graph: EdgeWeightedDigraph = None, witness_settle_limit: int = 50):
+        self.witness_settle_limit = witness_settle_limit
+        self.shortcuts_number = 0
+
+        if graph is None:
+            return
+
+        self.vertexes_number = graph.vertexes_number
+        self.rank = array(vertex_ids_typecode(self.vertexes_number), [-1]) * self.vertexes_number
+
+        # Remaining graph: out_edges[u][w] = in_edges[w][u] = (weight, middle vertex id)
+        self._out_edges = [{} for _ in range(self.vertexes_number)]
+        self._in_edges = [{} for _ in range(self.vertexes_number)]
+        self._contracted_neighbours = [0 for _ in range(self.vertexes_number)]
+        self._upward = [[] for _ in range(self.vertexes_number)]
+        self._downward = [[] for _ in range(self.vertexes_number)]
+
+        for edge in graph.edges:
+            u_id = edge.from_vertex().id
+            w_id = edge.to_vertex().id
+
+            if u_id != w_id and edge.weight < self._out_edges[u_id].get(w_id, (math.inf, -1))[0]:
+                self._out_edges[u_id][w_id] = (edge.weight, -1)
+                self._in_edges[w_id][u_id] = (edge.weight, -1)
+
+        self.__contract_all()
+        self.upward, self.upward_middle = self.__freeze(self._upward)
+        self.downward, self.downward_middle = self.__freeze(self._downward)
+
+        del self._out_edges, self._in_edges, self._contracted_neighbours, self._upward, self._downward
+
+    def __contract_all(self):
+        pq = IndexMinPriorityQueue()
+
+        for v_id in range(self.vertexes_number):
+            pq.add_to_queue(v_id, self._priority(v_id))
+
+        rank = 0
+        while not pq.is_empty():
+            v_id = pq.pop_min()
+
+            # Lazy update: priority could grow since it was computed
+            priority = self._priority(v_id)
+            if not pq.is_empty() and priority > pq.get_top_priority():
+                pq.add_to_queue(v_id, priority)
+                continue
+
+            self._contract(v_id)
+            self.rank[v_id] = rank
+            rank += 1
+
+    def _priority(self, v_id: int):
+        shortcuts = len(self._shortcuts_for(v_id))
+        removed_edges = len(self._out_edges[v_id]) + len(self._in_edges[v_id])
+        return shortcuts - removed_edges + self._contracted_neighbours[v_id]
+
+    def _shortcuts_for(self, v_id: int):
+        """
+        Shortcuts needed if vertex is contracted now
+        :param v_id: id of vertex
+        :return: list of (from id, to id, weight)
+        """
+        shortcuts = []
+        out_edges = self._out_edges[v_id]
+
+        if not out_edges:
+            return shortcuts
+
+        max_out_weight = max(weight for weight, _ in out_edges.values())
+
+        for u_id, (in_weight, _) in self._in_edges[v_id].items():
+            witness_dist = self._witness_search(u_id, v_id, in_weight + max_out_weight)
+
+            for w_id, (out_weight, _) in out_edges.items():
+                if w_id != u_id and witness_dist.get(w_id, math.inf) > in_weight + out_weight:
+                    shortcuts.append((u_id, w_id, in_weight + out_weight))
+
+        return shortcuts
+
+    def _witness_search(self, source_id: int, ignored_id: int, max_dist: float):
+        """
+        Limited Dijkstra over remaining graph which avoids vertex being contracted
+        :return: dict of found distances
+        """
+        dist_to = {source_id: 0}
+        pq = IndexMinPriorityQueue()
+        pq.add_to_queue(source_id, 0)
+        settled = 0
+
+        while not pq.is_empty() and settled < self.witness_settle_limit:
+            if pq.get_top_priority() > max_dist:
+                break
+
+            u_id = pq.pop_min()
+            settled += 1
+
+            for w_id, (weight, _) in self._out_edges[u_id].items():
+                if w_id == ignored_id:
+                    continue
+
+                dist = dist_to[u_id] + weight
+                if dist < dist_to.get(w_id, math.inf):
+                    dist_to[w_id] = dist
+                    if pq.contains(w_id):
+                        pq.update_priority(w_id, dist)
+                    else:
+                        pq.add_to_queue(w_id, dist)
+
+        return dist_to
+
+    def _contract(self, v_id: int):
+        for u_id, w_id, weight in self._shortcuts_for(v_id):
+            if weight < self._out_edges[u_id].get(w_id, (math.inf, -1))[0]:
+                self._out_edges[u_id][w_id] = (weight, v_id)
+                self._in_edges[w_id][u_id] = (weight, v_id)
+                self.shortcuts_number += 1
+
+        # All remaining neighbours will be contracted later, so they have higher rank
+        for w_id, (weight, middle_id) in self._out_edges[v_id].items():
+            self._upward[v_id].append((w_id, weight, middle_id))
+            del self._in_edges[w_id][v_id]
+            self._contracted_neighbours[w_id] += 1
+
+        for u_id, (weight, middle_id) in self._in_edges[v_id].items():
+            self._downward[v_id].append((u_id, weight, middle_id))
+            del self._out_edges[u_id][v_id]
+            self._contracted_neighbours[u_id] += 1
+
+        self._out_edges[v_id] = {}
+        self._in_edges[v_id] = {}
+
+    def __freeze(self, adjacencies: list):
+        offsets = array('q', [0])
+        targets = array(vertex_ids_typecode(self.vertexes_number))
+        weights = array('d')
+        middles = array(vertex_ids_typecode(self.vertexes_number))
+
+        for vertex_adjacencies in adjacencies:
+            for target_id, weight, middle_id in vertex_adjacencies:
+                targets.append(target_id)
+                weights.append(weight)
+                middles.append(middle_id)
+            offsets.append(len(targets))
+
+        csr = CSRGraph(self.vertexes_number, offsets, targets, edges_number=len(targets), weights=weights)
+        return csr, middles
+
+    def shortest_path(self, source_id: int, destination_id: int):
+        """
+        :param source_id: id of source vertex
+        :param destination_id: id of destination vertex
+        :return: distance and list of vertexes' ids on the path, (math.inf, None) if destination is unreachable
+        """
+        if source_id == destination_id:
+            return 0, None
+
+        forward = _UpwardSearch(self.upward, source_id)
+        backward = _UpwardSearch(self.downward, destination_id)
+        best_dist = math.inf
+        meeting_id = None
+
+        while True:
+            forward_top = forward.top_priority()
+            backward_top = backward.top_priority()
+
+            if min(forward_top, backward_top) >= best_dist:
+                break
+
+            search = forward if forward_top <= backward_top else backward
+            other = backward if search is forward else forward
+            v_id = search.settle_next()
+
+            if v_id in other.dist_to and search.dist_to[v_id] + other.dist_to[v_id] < best_dist:
+                best_dist = search.dist_to[v_id] + other.dist_to[v_id]
+                meeting_id = v_id
+
+        if meeting_id is None:
+            return math.inf, None
+
+        up_path = forward.path_to(meeting_id)
+        down_path = backward.path_to(meeting_id)
+        down_path.reverse()
+        return best_dist, self._unpack(up_path + down_path[1:])
+
+    def _unpack(self, path: list):
+        full_path = [path[0]]
+        stack = [(path[i], path[i + 1]) for i in range(len(path) - 2, -1, -1)]
+
+        while stack:
+            from_id, to_id = stack.pop()
+            middle_id = self._middle(from_id, to_id)
+
+            if middle_id == -1:
+                full_path.append(to_id)
+            else:
+                stack.append((middle_id, to_id))
+                stack.append((from_id, middle_id))
+
+        return full_path
+
+    def _middle(self, from_id: int, to_id: int):
+        if self.rank[from_id] < self.rank[to_id]:
+            graph, middles, owner_id, target_id = self.upward, self.upward_middle, from_id, to_id
+        else:
+            graph, middles, owner_id, target_id = self.downward, self.downward_middle, to_id, from_id
+
+        for position in range(graph.offsets[owner_id], graph.offsets[owner_id + 1]):
+            if graph.targets[position] == target_id:
+                return middles[position]
+
+        raise ValueError(f'There is no edge {from_id} -> {to_id} in hierarchy.')
+
+    def save(self, path):
+        """
+        Save preprocessed hierarchy to binary file.
+        Arrays are stored in native byte order with their typecodes and item sizes,
+        so file saved on another platform is converted on load.
+        :param path: path to file
+        :return: None
+        """
+        flags = BIG_ENDIAN_FLAG if sys.byteorder == 'big' else 0
+
+        with open(path, 'wb') as file:
+            file.write(HEADER.pack(
+                MAGIC, VERSION, flags, self.vertexes_number, len(self.upward.targets), len(self.downward.targets),
+                self.shortcuts_number,
+            ))
+            for part in self.__arrays():
+                write_array(file, part)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load hierarchy saved by save method
+        :param path: path to file
+        :return: ContractionHierarchy object
+        """
+        hierarchy = cls()
+
+        with open(path, 'rb') as file:
+            magic, version, flags, vertex_num, upward_num, downward_num, shortcuts_num = HEADER.unpack(
+                file.read(HEADER.size),
+            )
+
+            if magic != MAGIC:
+                raise ValueError(f'File "{path}" is not a contraction hierarchy file.')
+            if version != VERSION:
+                raise ValueError(f'Unsupported contraction hierarchy file version: {version}.')
+
+            swap = bool(flags & BIG_ENDIAN_FLAG) != (sys.byteorder == 'big')
+            sizes = [
+                vertex_num,
+                vertex_num + 1, upward_num, upward_num, upward_num,
+                vertex_num + 1, downward_num, downward_num, downward_num,
+            ]
+            parts = [read_array(file, size, swap) for size in sizes]
+
+        hierarchy.vertexes_number = vertex_num
+        hierarchy.shortcuts_number = shortcuts_num
+        hierarchy.rank = parts[0]
+        hierarchy.upward = CSRGraph(vertex_num, parts[1], parts[2], edges_number=upward_num, weights=parts[3])
+        hierarchy.upward_middle = parts[4]
+        hierarchy.downward = CSRGraph(vertex_num, parts[5], parts[6], edges_number=downward_num, weights=parts[7])
+        hierarchy.downward_middle = parts[8]
+        return hierarchy
+
+    def __arrays(self):
+        return [
+            self.rank,
+            self.upward.offsets, self.upward.targets, self.upward.weights, self.upward_middle,
+            self.downward.offsets, self.downward.targets, self.downward.weights, self.downward_middle,
+        ]
+
+
+class _UpwardSearch:
+    """
+    One direction of hierarchy query: Dijkstra over upward or downward graph.
+    """
+    def __init__(self, graph: CSRGraph, source_id: int):
+        self.graph = graph
+        self.dist_to = {source_id: 0}
+        self.edge_to = {}
+        self.pq = IndexMinPriorityQueue()
+        self.pq.add_to_queue(source_id, 0)
+
+    def top_priority(self):
+        if self.pq.is_empty():
+            return math.inf
+        return self.pq.get_top_priority()
+
+    def settle_next(self):
+        v_id = self.pq.pop_min()
+
+        for adj, weight in self.graph.weighted_adjacencies(v_id):
+            dist = self.dist_to[v_id] + weight
+
+            if dist < self.dist_to.get(adj, math.inf):
+                self.dist_to[adj] = dist
+                self.edge_to[adj] = v_id
+
+                if self.pq.contains(adj):
+                    self.pq.update_priority(adj, dist)
+                else:
+                    self.pq.add_to_queue(adj, dist)
+
+        return v_id
+
+    def path_to(self, v_id: int):
+        path = [v_id]
+
+        while v_id in self.edge_to:
+            v_id = self.edge_to[v_id]
+            path.append(v_id)
+
+        path.reverse()
+        return path
+
+
+if __name__ == '__main__':
+    import os
+    import tempfile
+    import time
+    from random import randint
+
+    from education_part.graphs import edge_weight_digraph_from_data, DijkstraShortestPath, Diedge
+
+    g_data = [
+        '8', '0 1 5.0', '0 4 9.0', '0 7 8.0', '1 2 12.0', '1 3 15.0', '1 7 4.0', '2 3 3.0', '2 6 11.0',
+        '3 6 9.0', '4 5 4.0', '4 6 20.0', '4 7 5.0', '5 2 1.0', '5 6 13.0', '7 5 6.0', '7 2 7.0',
+    ]
+    g = edge_weight_digraph_from_data(g_data, EdgeWeightedDigraph)
+    ch = ContractionHierarchy(g)
+    print(f'Shortcuts added: {ch.shortcuts_number}')
+    print(f'Dijkstra: {DijkstraShortestPath(g, g.vertexes[0]).shortest_path_to(g.vertexes[6])}')
+    print(f'Contraction hierarchy: {ch.shortest_path(0, 6)}')
+
+    print('\n--- Queries on grid ---')
+    side = 40
+    grid = EdgeWeightedDigraph(side * side)
+    for row in range(side):
+        for col in range(side):
+            v_id = row * side + col
+            for n_id in ([v_id + 1] if col + 1 < side else []) + ([v_id + side] if row + 1 < side else []):
+                weight = randint(1, 10)
+                grid.add_edge(Diedge(grid.vertexes[v_id], grid.vertexes[n_id], weight))
+                grid.add_edge(Diedge(grid.vertexes[n_id], grid.vertexes[v_id], weight))
+
+    start = time.time()
+    ch = ContractionHierarchy(grid)
+    print(f'Preprocessing, {ch.shortcuts_number} shortcuts:'.ljust(40), f'{round(time.time() - start, 5)} seconds')
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, 'grid.ch')
+        ch.save(file_path)
+        ch = ContractionHierarchy.load(file_path)
+
+    queries = [(randint(0, side * side - 1), randint(0, side * side - 1)) for _ in range(100)]
+
+    start = time.time()
+    dijkstra_results = [
+        DijkstraShortestPath(grid, grid.vertexes[s_id]).dist_to[d_id] if s_id != d_id else 0
+        for s_id, d_id in queries
+    ]
+    print(f'{len(queries)} Dijkstra queries:'.ljust(40), f'{round(time.time() - start, 5)} seconds')
+
+    start = time.time()
+    ch_results = [ch.shortest_path(s_id, d_id)[0] for s_id, d_id in queries]
+    print(f'{len(queries)} hierarchy queries:'.ljust(40), f'{round(time.time() - start, 5)} seconds')
+
+    if dijkstra_results != ch_results:
+        print('Distances are different!!!')
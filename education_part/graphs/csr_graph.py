@@ -0,0 +1,203 @@
+import math
+import operator
+from array import array
+from collections import Counter
+
+from education_part.data_structures import IndexMinPriorityQueue
+from education_part.graphs import Graph, vertex_ids_typecode
+
+
+class CSRGraph(Graph):
+    """
+    Read only graph in compressed sparse row representation.
+    Adjacencies of vertex with id "v" are targets[offsets[v]:offsets[v + 1]],
+    so the whole graph is stored in two flat arrays instead of one Vertex object and one list per vertex.
+    Weighted graphs keep weight of every adjacency in the same position of weights array.
+    Any buffers supporting buffer protocol may be used: arrays, memoryviews of mmap or shared memory.
+    """
+    def __init__(self, vertex_num: int, offsets, targets, edges_number: int, directed: bool = True, weights=None):
+        self.vertexes_number = vertex_num
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.weighted = weights is not None
+        self.edges_number = edges_number
+        self.directed = directed
+        self._targets_view = memoryview(self.targets)
+        self._weights_view = memoryview(self.weights) if self.weighted else None
+        self._degree_histogram = None
+        self._self_loops_number = None
+
+    def __repr__(self):
+        str_repr = ''
+        arrow = '->' if self.directed else '-'
+
+        for v_id in range(self.vertexes_number):
+            for adjacency in sorted(self.adjacencies(v_id)):
+                str_repr += f'{v_id} {arrow} {adjacency}\n'
+
+        return str_repr
+
+    @classmethod
+    def from_graph(cls, graph: Graph):
+        """
+        Freeze mutable graph into CSRGraph.
+        Adjacencies keep their order, so every search gives the same result on both representations.
+        :param graph: Undigraph, Digraph, EdgeWeightedGraph or EdgeWeightedDigraph object
+        :return: CSRGraph object
+        """
+        if isinstance(graph, CSRGraph):
+            return graph
+
+        offsets = array('q', [0])
+        targets = array(vertex_ids_typecode(graph.vertexes_number))
+        weights = array('d') if graph.weighted else None
+
+        for vertex in graph.vertexes:
+            if graph.weighted:
+                for edge in vertex.adjacencies:
+                    targets.append(edge.other_vertex(vertex).id)
+                    weights.append(edge.weight)
+            else:
+                targets.extend(vertex.adjacencies)
+
+            offsets.append(len(targets))
+
+        return cls(
+            vertex_num=graph.vertexes_number,
+            offsets=offsets,
+            targets=targets,
+            edges_number=graph.edges_number,
+            directed=graph.directed,
+            weights=weights,
+        )
+
+    def add_edge(self, id_1: int, id_2: int):
+        raise TypeError('CSRGraph is read only. Add edges to mutable graph and freeze it again.')
+
+    def adjacencies(self, v_id: int):
+        return self._targets_view[self.offsets[v_id]:self.offsets[v_id + 1]]
+
+    def weighted_adjacencies(self, v_id: int):
+        """
+        Get adjacencies of weighted graph
+        :param v_id: id of vertex
+        :return: iterable of (vertex id, weight) pairs
+        """
+        start, end = self.offsets[v_id], self.offsets[v_id + 1]
+        return zip(self._targets_view[start:end], self._weights_view[start:end])
+
+    def degree(self, v_id: int):
+        return self.offsets[v_id + 1] - self.offsets[v_id]
+
+    def degree_histogram(self):
+        """
+        Histogram of degrees computed once from differences of neighbouring offsets - graph is read only
+        :return: list of ints
+        """
+        if self._degree_histogram is None:
+            counts = Counter(map(operator.sub, self.offsets[1:], self.offsets[:-1]))
+            self._degree_histogram = [0] * (max(counts, default=0) + 1)
+
+            for degree, vertexes_number in counts.items():
+                self._degree_histogram[degree] = vertexes_number
+
+        return list(self._degree_histogram)
+
+    def self_loops_number(self):
+        if self._self_loops_number is None:
+            self._self_loops_number = super().self_loops_number()
+
+        return self._self_loops_number
+
+    def memory_usage(self):
+        """
+        Size of buffers with graph structure
+        :return: int: bytes
+        """
+        size = self.offsets.itemsize * len(self.offsets) + self.targets.itemsize * len(self.targets)
+
+        if self.weighted:
+            size += self.weights.itemsize * len(self.weights)
+
+        return size
+
+
+def dijkstra_distances(graph: CSRGraph, source_id: int):
+    """
+    Dijkstra shortest paths over weighted CSRGraph.
+    :param graph: weighted CSRGraph object
+    :param source_id: id of source vertex
+    :return: array of distances from source, math.inf for unreachable vertexes
+    """
+    offsets = graph.offsets
+    targets = graph.targets
+    weights = graph.weights
+    dist_to = array('d', [math.inf]) * graph.vertexes_number
+    dist_to[source_id] = 0
+    pq = IndexMinPriorityQueue()
+    pq.add_to_queue(source_id, 0)
+
+    while not pq.is_empty():
+        v_id = pq.pop_min()
+        v_dist = dist_to[v_id]
+
+        for position in range(offsets[v_id], offsets[v_id + 1]):
+            adj = targets[position]
+            dist = v_dist + weights[position]
+
+            if dist < dist_to[adj]:
+                if pq.contains(adj):
+                    pq.update_priority(adj, dist)
+                else:
+                    pq.add_to_queue(adj, dist)
+                dist_to[adj] = dist
+
+    return dist_to
+
+
+if __name__ == '__main__':
+    import time
+    from random import randint
+
+    from education_part.graphs import (
+        graph_from_data, Undigraph, Digraph, TypicalGraphProcessing, DepthFirstSearch, BreadthFirstSearch,
+        ConnectedComponents, TopologicalSort, graph_memory_usage,
+    )
+
+    g = graph_from_data(
+        data=['13', '0 5', '4 3', '0 1', '9 12', '6 4', '5 4', '0 2', '11 12', '9 10', '0 6', '7 8', '9 11', '3 5'],
+        graph_type=Undigraph,
+    )
+    csr = CSRGraph.from_graph(g)
+    print(csr)
+    print(f'Vertexes in graph: {csr.vertexes_number}')
+    print(f'Edges in graph: {csr.edges_number}')
+    print(f'Max graphs degree: {TypicalGraphProcessing.max_degree(csr)}')
+    print(f'Degree histogram: {TypicalGraphProcessing.degree_histogram(csr)}')
+    print(f'Adjacencies of vertex 12: {list(TypicalGraphProcessing.vertex_adjacencies(csr, 12))}')
+    print(f'DFS path from 0 to 3: {DepthFirstSearch(csr, 0).path_to(3)}')
+    print(f'BFS path from 0 to 3: {BreadthFirstSearch(csr, 0).path_to(3)}')
+    print(f'Components ids: {ConnectedComponents(csr).component_id}')
+
+    g2 = graph_from_data(
+        data=[7, '0 5', '0 2', '0 1', '3 6', '3 5', '3 4', '5 2', '6 4', '6 0', '3 2', '1 4'],
+        graph_type=Digraph,
+    )
+    print(f'Topological sort: {TopologicalSort(CSRGraph.from_graph(g2)).path}')
+
+    print('\n--- Memory and traversal time ---')
+    size = 20_000
+    big = Digraph(size)
+    for _ in range(size * 10):
+        big.add_edge(randint(0, size - 1), randint(0, size - 1))
+
+    usage = graph_memory_usage(big)
+    big_csr = CSRGraph.from_graph(big)
+    print(f'Bytes per edge in Digraph: {round((usage["vertexes"] + usage["edges"]) / big.edges_number, 2)}')
+    print(f'Bytes per edge in CSRGraph: {round(big_csr.memory_usage() / big_csr.edges_number, 2)}')
+
+    for graph in (big, big_csr):
+        start = time.time()
+        BreadthFirstSearch(graph, 0)
+        print(f'BFS on {graph.__class__.__name__}:'.ljust(30), f'{round(time.time() - start, 5)} seconds')
@@ -0,0 +1,196 @@
+import heapq
+import math
+from multiprocessing import Pool
+
+from education_part.graphs import Vertex, EdgeWeightedDigraph, ShortestPath, SharedGraph, attach_graph
+
+# Graph attached by worker process of the pool
+_worker_graph = None
+
+
+def _attach_worker(descriptor: dict):
+    global _worker_graph
+    _worker_graph = attach_graph(descriptor)
+
+
+def _worker_requests(task):
+    """
+    Relaxation requests for part of bucket
+    :param task: (list of (vertex id, distance), delta, light - True for edges not heavier than delta)
+    :return: list of (target id, new distance, vertex id, index of edge in adjacencies of vertex)
+    """
+    vertexes, delta, light = task
+    _, graph = _worker_graph
+    requests = []
+
+    for v_id, v_dist in vertexes:
+        start = graph.offsets[v_id]
+
+        for position in range(start, graph.offsets[v_id + 1]):
+            weight = graph.weights[position]
+
+            if (weight <= delta) == light:
+                requests.append((graph.targets[position], v_dist + weight, v_id, position - start))
+
+    return requests
+
+
+class DeltaSteppingShortestPath(ShortestPath):
+    """
+    Delta-stepping single source shortest paths.
+    Vertexes are kept in buckets of width delta by their tentative distance instead of binary heap,
+    only ids of buckets are kept in heap to find the next bucket.
+    Bucket with the smallest index is processed in phases: all its vertexes relax light edges (weight <= delta)
+    at once, which may return vertexes to the same bucket; when bucket stays empty, heavy edges
+    of all removed vertexes are relaxed. Relaxations inside a phase are independent, so requests of big buckets
+    may be generated by pool of processes over graph in shared memory.
+    Small delta gives Dijkstra-like behaviour, big delta - Bellman-Ford-like.
+    """
+    def __init__(
+            self,
+            graph: EdgeWeightedDigraph,
+            source_vertex: Vertex,
+            delta: float = None,
+            processes: int = None,
+            parallel_threshold: int = 10_000,
+    ):
+        self.graph = graph
+        self.source_vertex = source_vertex
+        self.edge_to = [None for _ in range(self.graph.vertexes_number)]
+        self.dist_to = [math.inf for _ in range(self.graph.vertexes_number)]
+        self.delta = delta if delta is not None else self._default_delta()
+        self.processes = processes
+        self.parallel_threshold = parallel_threshold
+        self.buckets = {}
+        self._bucket_ids = []  # heap of ids of buckets, id is pushed when bucket is created
+        self.phases = 0
+        self._pool = None
+
+        if processes is None:
+            self._run()
+            return
+
+        with SharedGraph(self.graph) as shared:
+            with Pool(processes, initializer=_attach_worker, initargs=(shared.descriptor,)) as self._pool:
+                self._run()
+
+        self._pool = None
+
+    def _default_delta(self):
+        """
+        Average weight of edge: bucket holds about one edge length of distances
+        """
+        if not self.graph.edges_number:
+            return 1
+
+        return sum(edge.weight for edge in self.graph.edges) / self.graph.edges_number or 1
+
+    def _run(self):
+        self._relax(self.source_vertex.id, 0, None)
+
+        while self._bucket_ids:
+            bucket_id = heapq.heappop(self._bucket_ids)
+            if bucket_id not in self.buckets:
+                continue
+
+            removed = set()
+
+            while self.buckets.get(bucket_id):
+                frontier = self.buckets.pop(bucket_id)
+                removed |= frontier
+                self._relax_requests(self._requests(frontier, light=True))
+                self.phases += 1
+
+            self.buckets.pop(bucket_id, None)
+            self._relax_requests(self._requests(removed, light=False))
+
+    def _requests(self, vertexes, light: bool):
+        if self._pool is not None and len(vertexes) >= self.parallel_threshold:
+            return self._parallel_requests(vertexes, light)
+
+        requests = []
+
+        for v_id in vertexes:
+            v_dist = self.dist_to[v_id]
+
+            for edge in self.graph.vertexes[v_id].adjacencies:
+                if (edge.weight <= self.delta) == light:
+                    requests.append((edge.to_vertex().id, v_dist + edge.weight, edge))
+
+        return requests
+
+    def _parallel_requests(self, vertexes, light: bool):
+        vertexes = [(v_id, self.dist_to[v_id]) for v_id in vertexes]
+        chunk_size = math.ceil(len(vertexes) / self.processes)
+        tasks = [(vertexes[i:i + chunk_size], self.delta, light) for i in range(0, len(vertexes), chunk_size)]
+        requests = []
+
+        for chunk_requests in self._pool.imap_unordered(_worker_requests, tasks):
+            for to_id, dist, from_id, edge_index in chunk_requests:
+                requests.append((to_id, dist, self.graph.vertexes[from_id].adjacencies[edge_index]))
+
+        return requests
+
+    def _relax_requests(self, requests):
+        for v_id, dist, edge in requests:
+            self._relax(v_id, dist, edge)
+
+    def _relax(self, v_id: int, dist: float, edge):
+        if dist >= self.dist_to[v_id]:
+            return
+
+        if self.dist_to[v_id] != math.inf:
+            old_bucket = self.buckets.get(int(self.dist_to[v_id] // self.delta))
+            if old_bucket is not None:
+                old_bucket.discard(v_id)
+
+        self.dist_to[v_id] = dist
+        self.edge_to[v_id] = edge
+
+        bucket_id = int(dist // self.delta)
+        bucket = self.buckets.get(bucket_id)
+        if bucket is None:
+            bucket = self.buckets[bucket_id] = set()
+            heapq.heappush(self._bucket_ids, bucket_id)
+        bucket.add(v_id)
+
+
+if __name__ == '__main__':
+    import time
+    from random import randint
+
+    from education_part.graphs import edge_weight_digraph_from_data, DijkstraShortestPath, Diedge
+
+    g_data = [
+        '8', '0 1 5.0', '0 4 9.0', '0 7 8.0', '1 2 12.0', '1 3 15.0', '1 7 4.0', '2 3 3.0', '2 6 11.0',
+        '3 6 9.0', '4 5 4.0', '4 6 20.0', '4 7 5.0', '5 2 1.0', '5 6 13.0', '7 5 6.0', '7 2 7.0',
+    ]
+    g = edge_weight_digraph_from_data(g_data, EdgeWeightedDigraph)
+    print(f'Dijkstra: {DijkstraShortestPath(g, g.vertexes[0]).shortest_path_to(g.vertexes[6])}')
+    print(f'Delta stepping: {DeltaSteppingShortestPath(g, g.vertexes[0]).shortest_path_to(g.vertexes[6])}')
+
+    print('\n--- Integer weights ---')
+    size = 3_000
+    big = EdgeWeightedDigraph(size)
+    for _ in range(size * 5):
+        big.add_edge(Diedge(big.vertexes[randint(0, size - 1)], big.vertexes[randint(0, size - 1)], randint(1, 10)))
+
+    start = time.time()
+    dijkstra = DijkstraShortestPath(big, big.vertexes[0])
+    print(f'Dijkstra:'.ljust(40), f'{round(time.time() - start, 5)} seconds')
+
+    for delta in (1, 5, 20):
+        start = time.time()
+        delta_stepping = DeltaSteppingShortestPath(big, big.vertexes[0], delta=delta)
+        print(f'Delta stepping, delta {delta}, {delta_stepping.phases} phases:'.ljust(40), end='')
+        print(f' {round(time.time() - start, 5)} seconds')
+
+        if delta_stepping.dist_to != dijkstra.dist_to:
+            print('Distances are different!!!')
+
+    start = time.time()
+    delta_stepping = DeltaSteppingShortestPath(big, big.vertexes[0], delta=20, processes=2, parallel_threshold=500)
+    print(f'Delta stepping with 2 processes:'.ljust(40), f'{round(time.time() - start, 5)} seconds')
+
+    if delta_stepping.dist_to != dijkstra.dist_to:
+        print('Distances are different!!!')
@@ -1,11 +1,19 @@
-from education_part.graphs import Graph, Vertex
+from array import array
+
+from education_part.graphs import (
+    Graph, Vertex, check_vertex_id, check_vertex_ids, depth_first_walk, vertex_ids_typecode, PREORDER, POSTORDER,
+)
 
 
 class Digraph(Graph):
+    directed = True
+
     def __init__(self, vertex_num):
         self.vertexes_number = vertex_num
         self.vertexes = [Vertex(v_id) for v_id in range(vertex_num)]
         self.edges_number = 0
+        self.listeners = []
+        self._start_degree_statistics()
 
     def __repr__(self):
         str_repr = ''
@@ -17,71 +25,374 @@ class Digraph(Graph):
         return str_repr
 
     def add_edge(self, id_1: int, id_2: int):
-        if id_1 > self.vertexes_number:
-            raise IndexError(id_1)
-        if id_2 > self.vertexes_number:
-            raise IndexError(id_2)
+        check_vertex_id(id_1, self.vertexes_number)
+        check_vertex_id(id_2, self.vertexes_number)
+
+        for listener in self.listeners:
+            listener(id_1, id_2)
 
+        self._degrees_changing((id_1,))
         self.edges_number += 1
         self.vertexes[id_1].adjacencies.append(id_2)
+        self._degrees_changed((id_1,))
+
+        if id_1 == id_2:
+            self._self_loops_number += 1
+
+    def add_edges(self, ids_1, ids_2):
+        """
+        Add many edges at once
+        :param ids_1: sequence of ids of vertexes edges start from
+        :param ids_2: sequence of ids of vertexes edges go to
+        :return: None
+        """
+        if len(ids_1) != len(ids_2):
+            raise ValueError('ids_1 and ids_2 have different lengths')
+
+        check_vertex_ids(ids_1, self.vertexes_number)
+        check_vertex_ids(ids_2, self.vertexes_number)
+
+        if self.listeners:
+            for id_1, id_2 in zip(ids_1, ids_2):
+                self.add_edge(id_1, id_2)
+            return
+
+        changed = set(ids_1)
+        self._degrees_changing(changed)
+
+        vertexes = self.vertexes
+        for id_1, id_2 in zip(ids_1, ids_2):
+            vertexes[id_1].adjacencies.append(id_2)
+
+            if id_1 == id_2:
+                self._self_loops_number += 1
+
+        self.edges_number += len(ids_1)
+        self._degrees_changed(changed)
+
+    def degree_histogram(self):
+        return list(self._degree_histogram)
+
+    def self_loops_number(self):
+        return self._self_loops_number
+
+    def subscribe(self, listener):
+        """
+        Subscribe to new edges of the graph.
+        Listener is called as listener(id_1, id_2) before edge is added, so it may reject the edge by raising.
+        :param listener: callable
+        :return: None
+        """
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
 
 
 class TopologicalSort:
     def __init__(self, graph: Graph):
         self.graph = graph
-        self.marked = [False for _ in range(len(graph.vertexes))]
+        self.marked = [False for _ in range(graph.vertexes_number)]
         self.path = []
 
-        for vertex in self.graph.vertexes:
-            if not self.marked[vertex.id]:
-                self.__depth_first_paths(vertex_id=vertex.id)
+        for vertex_id in range(self.graph.vertexes_number):
+            if not self.marked[vertex_id]:
+                self.__depth_first_paths(vertex_id=vertex_id)
 
     def __depth_first_paths(self, vertex_id):
-        self.marked[vertex_id] = True
+        for event, adj, _ in depth_first_walk(self.graph.adjacencies, vertex_id, self.marked):
+            if event == POSTORDER:
+                self.path.append(adj)
 
-        for adj in self.graph.vertexes[vertex_id].adjacencies:
-            if not self.marked[adj]:
-                self.__depth_first_paths(adj)
 
-        self.path.append(vertex_id)
+WHITE = 0  # not visited
+GRAY = 1  # on the stack of depth first walk
+BLACK = 2  # all descendants are processed
 
 
 class CycleDetector:
-    def __init__(self, graph: Graph):
+    """
+    Depth first walk with three colors of vertexes: edge to gray vertex is back edge and closes a cycle.
+    Color check is O(1), so detector is linear in size of the graph.
+    By default walk stops on first cycle, with all_back_edges=True it visits the whole graph
+    and collects every back edge in back_edges.
+    """
+    def __init__(self, graph: Graph, all_back_edges: bool = False):
         self.graph = graph
-        self.marked = [False for _ in range(len(graph.vertexes))]
-        self.path = []
+        self.all_back_edges = all_back_edges
+        self.color = bytearray(graph.vertexes_number)
+        self.edge_to = array(vertex_ids_typecode(graph.vertexes_number), [-1]) * graph.vertexes_number
+        self.back_edges = []
         self.cycle = False
-        self.stop = False
         self.cycle_path = []
 
-        for vertex in self.graph.vertexes:
-            if not self.marked[vertex.id] and not self.stop:
-                self.__depth_first_paths(vertex_id=vertex.id)
+        for vertex_id in range(self.graph.vertexes_number):
+            if self.color[vertex_id] == WHITE and (all_back_edges or not self.cycle):
+                self.__depth_first_paths(vertex_id=vertex_id)
 
     def __depth_first_paths(self, vertex_id):
-        self.marked[vertex_id] = True
-        self.path.append(vertex_id)
+        # walker marks vertex with True == GRAY when visits it first time
+        for event, v_id, other in depth_first_walk(self.graph.adjacencies, vertex_id, self.color):
+            if event == PREORDER:
+                if other is not None:
+                    self.edge_to[v_id] = other
+            elif event == POSTORDER:
+                self.color[v_id] = BLACK
+            elif self.color[other] == GRAY:
+                self.back_edges.append((v_id, other))
 
-        for adj in self.graph.vertexes[vertex_id].adjacencies:
-            if self.stop:
-                break
-
-            if not self.marked[adj]:
-                self.__depth_first_paths(adj)
-            else:
-                if adj in self.path:
+                if not self.cycle:
                     self.cycle = True
-                    self.stop = True
-                    self.cycle_path = self.path[self.path.index(adj):] + [adj]
+                    self.cycle_path = self.__cycle_path(v_id, other)
+
+                if not self.all_back_edges:
+                    break
+
+    def __cycle_path(self, from_id, to_id):
+        path = [to_id]
+        v_id = from_id
 
-        if not self.stop:
-            self.path.pop()
+        while v_id != to_id:
+            path.append(v_id)
+            v_id = self.edge_to[v_id]
+
+        path.append(to_id)
+        path[1:-1] = reversed(path[1:-1])
+        return path
 
     def get_cycle(self):
         if not self.cycle:
             return
 
+        return self.cycle_path
+
+
+class OnlineCycleDetector:
+    """
+    Keeps topological order of acyclic Digraph while edges are added (Pearce-Kelly algorithm)
+    and finds the first edge which closes a cycle without scanning the whole graph.
+    Edge v -> w which agrees with the order costs O(1). Otherwise only vertexes between w and v in the order
+    are searched: forward from w and backward to v, and the two found sets swap their positions.
+    With reject=True edge which closes a cycle is not added and ValueError is raised, otherwise edge is added,
+    cycle is reported in cycle_path and detector stops following the graph.
+    """
+    def __init__(self, graph: Digraph, reject: bool = True):
+        detector = CycleDetector(graph)
+        if detector.cycle:
+            raise ValueError(f'Graph already has cycle: {detector.cycle_path}')
+
+        self.graph = graph
+        self.reject = reject
+        self.cycle = False
+        self.cycle_path = []
+        self.incoming = [[] for _ in range(graph.vertexes_number)]
+        for v_id in range(graph.vertexes_number):
+            for adj in graph.adjacencies(v_id):
+                self.incoming[adj].append(v_id)
+
+        typecode = vertex_ids_typecode(graph.vertexes_number)
+        self.vertex_at = array(typecode, reversed(TopologicalSort(graph).path))
+        self.order = array(typecode, [0]) * graph.vertexes_number
+        for position, v_id in enumerate(self.vertex_at):
+            self.order[v_id] = position
+
+        self.graph.subscribe(self._on_edge)
+
+    def close(self):
+        """
+        Stop following new edges of the graph
+        :return: None
+        """
+        self.graph.unsubscribe(self._on_edge)
+
+    def topological_order(self):
+        return list(self.vertex_at)
+
+    def _on_edge(self, from_id: int, to_id: int):
+        if from_id == to_id:
+            self.__report([from_id, to_id])
+            return
+
+        lower_bound = self.order[to_id]
+        upper_bound = self.order[from_id]
+
+        if lower_bound > upper_bound:
+            self.incoming[to_id].append(from_id)
+            return
+
+        forward, cycle_path = self.__forward(to_id, from_id, upper_bound)
+
+        if cycle_path is not None:
+            self.__report(cycle_path)
+            return
+
+        backward = self.__backward(from_id, lower_bound)
+        self.__reorder(backward, forward)
+        self.incoming[to_id].append(from_id)
+
+    def __forward(self, start_id, cycle_id, upper_bound):
+        """
+        Vertexes reachable from start_id, which are not after upper_bound in the order
+        :return: (list of found vertexes, cycle path if cycle_id is reached or None)
+        """
+        parent = {start_id: None}
+        stack = [start_id]
+
+        while stack:
+            v_id = stack.pop()
+
+            for adj in self.graph.adjacencies(v_id):
+                if adj in parent or self.order[adj] > upper_bound:
+                    continue
+
+                parent[adj] = v_id
+                if adj == cycle_id:
+                    path = [adj]
+                    while path[-1] is not None:
+                        path.append(parent[path[-1]])
+                    path[-1] = cycle_id
+                    path.reverse()
+                    return None, path
+
+                stack.append(adj)
+
+        return list(parent), None
+
+    def __backward(self, start_id, lower_bound):
+        """
+        Vertexes which reach start_id, which are not before lower_bound in the order
+        """
+        found = {start_id}
+        stack = [start_id]
+
+        while stack:
+            v_id = stack.pop()
+
+            for adj in self.incoming[v_id]:
+                if adj not in found and self.order[adj] >= lower_bound:
+                    found.add(adj)
+                    stack.append(adj)
+
+        return list(found)
+
+    def __reorder(self, backward, forward):
+        """
+        Give positions of both sets to backward vertexes first and then to forward ones, keeping order inside sets
+        """
+        backward.sort(key=self.order.__getitem__)
+        forward.sort(key=self.order.__getitem__)
+        positions = sorted(self.order[v_id] for v_id in backward + forward)
+
+        for position, v_id in zip(positions, backward + forward):
+            self.order[v_id] = position
+            self.vertex_at[position] = v_id
+
+    def __report(self, cycle_path):
+        self.cycle = True
+        self.cycle_path = cycle_path
+
+        if self.reject:
+            raise ValueError(f'Edge {cycle_path[0]} -> {cycle_path[1]} closes cycle: {cycle_path}')
+
+        self.close()
+
+
+class StronglyConnectedComponents:
+    """
+    Tarjan's algorithm over iterative depth first walk, linear in size of the graph.
+    Every vertex gets index in preorder and low - the smallest index reachable from its subtree through
+    at most one non-tree edge to vertex which is still on the stack. Vertex with low equal to its index is root
+    of component: all vertexes above it on the stack belong to the component.
+    Components are found in reverse topological order of condensation: component 0 has no edges to other ones.
+    """
+    def __init__(self, graph: Graph):
+        self.graph = graph
+        self.marked = [False for _ in range(graph.vertexes_number)]
+        typecode = vertex_ids_typecode(graph.vertexes_number)
+        self.component_id = array(typecode, [-1]) * graph.vertexes_number
+        self.components_count = 0
+
+        self._index = array(typecode, [0]) * graph.vertexes_number
+        self._low = array(typecode, [0]) * graph.vertexes_number
+        self._on_stack = bytearray(graph.vertexes_number)
+        self._stack = []
+        self._counter = 0
+
+        for vertex_id in range(self.graph.vertexes_number):
+            if not self.marked[vertex_id]:
+                self.__depth_first_paths(vertex_id)
+
+        del self._index, self._low, self._on_stack, self._stack
+
+    def __depth_first_paths(self, vertex_id):
+        index = self._index
+        low = self._low
+        on_stack = self._on_stack
+        stack = self._stack
+
+        for event, v_id, other in depth_first_walk(self.graph.adjacencies, vertex_id, self.marked):
+            if event == PREORDER:
+                index[v_id] = low[v_id] = self._counter
+                self._counter += 1
+                stack.append(v_id)
+                on_stack[v_id] = True
+            elif event == POSTORDER:
+                if low[v_id] == index[v_id]:
+                    while True:
+                        w_id = stack.pop()
+                        on_stack[w_id] = False
+                        self.component_id[w_id] = self.components_count
+                        if w_id == v_id:
+                            break
+                    self.components_count += 1
+
+                if other is not None and low[v_id] < low[other]:
+                    low[other] = low[v_id]
+            elif on_stack[other] and index[other] < low[v_id]:
+                low[v_id] = index[other]
+
+    def components_number(self):
+        return self.components_count
+
+    def strongly_connected(self, v_id: int, w_id: int):
+        return self.component_id[v_id] == self.component_id[w_id]
+
+    def components(self):
+        """
+        :return: list of lists of vertexes' ids, one list per component
+        """
+        components = [[] for _ in range(self.components_count)]
+
+        for v_id, c_id in enumerate(self.component_id):
+            components[c_id].append(v_id)
+
+        return components
+
+    def condensation(self):
+        """
+        Graph of components: vertex per component and one edge for all edges between two components.
+        Condensation is a DAG, edges go from bigger components' ids to smaller ones.
+        :return: Digraph object
+        """
+        edges = set()
+        count = self.components_count
+
+        for v_id in range(self.graph.vertexes_number):
+            v_component = self.component_id[v_id]
+
+            for adj in self.graph.adjacencies(v_id):
+                if (adj_component := self.component_id[adj]) != v_component:
+                    edges.add(v_component * count + adj_component)
+
+        typecode = vertex_ids_typecode(count)
+        edges = sorted(edges)
+        condensation = Digraph(count)
+        condensation.add_edges(
+            array(typecode, (edge // count for edge in edges)),
+            array(typecode, (edge % count for edge in edges)),
+        )
+        return condensation
+
 
 if __name__ == '__main__':
     from education_part.graphs import graph_from_data, TypicalGraphProcessing, DepthFirstSearch, BreadthFirstSearch
@@ -102,6 +413,8 @@ if __name__ == '__main__':
     print(f'Max graphs degree: {TypicalGraphProcessing.max_degree(g)}')
     print(f'Average graphs degree: {TypicalGraphProcessing.average_degree(g)}')
     print(f'Number of self loops: {TypicalGraphProcessing.self_loops_number(g)}')
+    print(f'Degree histogram: {TypicalGraphProcessing.degree_histogram(g)}')
+    print(f'90th percentile of degrees: {TypicalGraphProcessing.degree_percentile(g, 90)}')
     print(f'Adjacencies of vertex 12: {TypicalGraphProcessing.vertex_adjacencies(g, 12)}')
     print(f'Degree of vertex 12: {TypicalGraphProcessing.vertex_degree(g, 12)}')
     print(f'Adjacencies of vertex 5: {TypicalGraphProcessing.vertex_adjacencies(g, 5)}')
@@ -152,4 +465,114 @@ if __name__ == '__main__':
     )
     cd = CycleDetector(g3)
     print(g3)
-    print(f'First founded cycle in graph: {cd.cycle_path}')
+    print(f'First founded cycle in graph: {cd.get_cycle()}')
+    print(f'All back edges: {CycleDetector(g3, all_back_edges=True).back_edges}')
+
+    # Online Cycle Detector
+    print('\n--- Online Cycle Detector ---')
+    g5 = Digraph(7)
+    online = OnlineCycleDetector(g5)
+    for id_1, id_2 in ((0, 5), (0, 2), (0, 1), (3, 6), (3, 5), (3, 4), (5, 2), (6, 4), (6, 0), (2, 3), (1, 4)):
+        try:
+            g5.add_edge(id_1, id_2)
+        except ValueError as e:
+            print(f'ValueError: {e}')
+    print(f'Topological order: {online.topological_order()}')
+
+    # Strongly connected components
+    print('\n--- Strongly connected components ---')
+    g4 = graph_from_data(
+        data=[
+            13, '4 2', '2 3', '3 2', '6 0', '0 1', '2 0', '11 12', '12 9', '9 10', '9 11', '7 9', '10 12', '11 4',
+            '4 3', '3 5', '6 8', '8 6', '5 4', '0 5', '6 4', '6 9', '7 6',
+        ],
+        graph_type=Digraph,
+    )
+    scc = StronglyConnectedComponents(g4)
+    print(f'Number of strongly connected components: {scc.components_number()}')
+    print(f'Components: {scc.components()}')
+    print(f'Vertexes 0 and 3 are strongly connected: {scc.strongly_connected(0, 3)}')
+    print(f'Condensation:\n{scc.condensation()}')
+
+    # Deep graphs: recursive realisation fails here with RecursionError
+    print('\n--- Depth first algorithms on deep graphs ---')
+    import time
+
+    chain_size = 200_000
+    chain = Digraph(chain_size)
+    for i in range(chain_size - 1):
+        chain.add_edge(i, i + 1)
+
+    grid_side = 400
+    grid = Digraph(grid_side * grid_side)
+    for row in range(grid_side):
+        for col in range(grid_side):
+            if col + 1 < grid_side:
+                grid.add_edge(row * grid_side + col, row * grid_side + col + 1)
+            if row + 1 < grid_side:
+                grid.add_edge(row * grid_side + col, (row + 1) * grid_side + col)
+
+    for name, deep_graph in (('chain', chain), ('grid', grid)):
+        for algorithm in (TopologicalSort, CycleDetector):
+            start = time.time()
+            algorithm(deep_graph)
+            print(f'{algorithm.__name__} on {name} of {deep_graph.vertexes_number} vertexes:'.ljust(60), end='')
+            print(f' {round(time.time() - start, 5)} seconds')
+
+    print('\n--- Strongly connected components against DFS from every vertex ---')
+    from random import randint
+
+    size = 1_000
+    random_graph = Digraph(size)
+    random_graph.add_edges(
+        [randint(0, size - 1) for _ in range(size * 2)],
+        [randint(0, size - 1) for _ in range(size * 2)],
+    )
+
+    start = time.time()
+    reachable = [DepthFirstSearch(random_graph, v_id).marked for v_id in range(size)]
+    dfs_components = {
+        frozenset(w_id for w_id in range(size) if reachable[v_id][w_id] and reachable[w_id][v_id])
+        for v_id in range(size)
+    }
+    print(f'DepthFirstSearch from every vertex:'.ljust(60), f'{round(time.time() - start, 5)} seconds')
+
+    start = time.time()
+    scc = StronglyConnectedComponents(random_graph)
+    print(f'StronglyConnectedComponents:'.ljust(60), f'{round(time.time() - start, 5)} seconds')
+
+    if dfs_components != set(frozenset(component) for component in scc.components()):
+        print('Components are different!!!')
+
+    for name, deep_graph in (('chain', chain), ('grid', grid)):
+        start = time.time()
+        StronglyConnectedComponents(deep_graph)
+        print(f'StronglyConnectedComponents on {name} of {deep_graph.vertexes_number} vertexes:'.ljust(60), end='')
+        print(f' {round(time.time() - start, 5)} seconds')
+
+    print('\n--- Online cycle checks against DepthFirstSearch before every edge ---')
+    size = 500
+    edges = [(randint(0, size - 1), randint(0, size - 1)) for _ in range(size * 2)]
+
+    start = time.time()
+    online_graph = Digraph(size)
+    OnlineCycleDetector(online_graph)
+    online_rejected = 0
+    for id_1, id_2 in edges:
+        try:
+            online_graph.add_edge(id_1, id_2)
+        except ValueError:
+            online_rejected += 1
+    print(f'OnlineCycleDetector, {online_rejected} edges rejected:'.ljust(60), end='')
+    print(f' {round(time.time() - start, 5)} seconds')
+
+    start = time.time()
+    checked_graph = Digraph(size)
+    rejected = 0
+    for id_1, id_2 in edges:
+        if DepthFirstSearch(checked_graph, id_2).has_path_to(id_1):
+            rejected += 1
+        else:
+            checked_graph.add_edge(id_1, id_2)
+    print(f'DepthFirstSearch before every edge, {rejected} edges rejected:'.ljust(60), end='')
+    print(f' {round(time.time() - start, 5)} seconds')
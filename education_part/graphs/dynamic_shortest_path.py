@@ -0,0 +1,157 @@
+import math
+
+from education_part.data_structures import IndexMinPriorityQueue
+from education_part.graphs import Vertex, Diedge, EdgeWeightedDigraph, ShortestPath, DijkstraShortestPath
+
+
+class DynamicShortestPath(ShortestPath):
+    """
+    Shortest paths from source which are kept up to date while the graph changes.
+    Object subscribes to the graph and on every change repairs only affected part of the tree:
+        new edge or decreased weight - if edge gives shorter path to its end, Dijkstra continues from there
+        increased weight of tree edge - subtree under the edge is reset, gets distances from the rest of the tree
+        through incoming edges, and then Dijkstra continues from it
+    Number of vertexes which distances were recomputed is kept in last_update_touched.
+    """
+    def __init__(self, graph: EdgeWeightedDigraph, source_vertex: Vertex):
+        self.graph = graph
+        self.source_vertex = source_vertex
+
+        initial = DijkstraShortestPath(graph, source_vertex)
+        self.dist_to = initial.dist_to
+        self.edge_to = initial.edge_to
+
+        self.updates = 0
+        self.last_update_touched = 0
+        self.total_touched = 0
+
+        self.graph.subscribe(self._on_change)
+
+    def close(self):
+        """
+        Stop following changes of the graph
+        :return: None
+        """
+        self.graph.unsubscribe(self._on_change)
+
+    def _on_change(self, edge: Diedge, old_weight: float):
+        if old_weight is None or edge.weight <= old_weight:
+            touched = self._decrease(edge)
+        else:
+            touched = self._increase(edge)
+
+        self.updates += 1
+        self.last_update_touched = touched
+        self.total_touched += touched
+
+    def _decrease(self, edge: Diedge):
+        v1 = edge.from_vertex().id
+        v2 = edge.to_vertex().id
+
+        if self.dist_to[v1] + edge.weight >= self.dist_to[v2]:
+            return 0
+
+        self.dist_to[v2] = self.dist_to[v1] + edge.weight
+        self.edge_to[v2] = edge
+        pq = IndexMinPriorityQueue()
+        pq.add_to_queue(v2, self.dist_to[v2])
+        return self._propagate(pq)
+
+    def _increase(self, edge: Diedge):
+        root = edge.to_vertex().id
+
+        if self.edge_to[root] is not edge:
+            return 0
+
+        # Subtree of shortest paths tree which goes through changed edge
+        affected = {root}
+        stack = [root]
+        while stack:
+            v_id = stack.pop()
+            for adj in self.graph.vertexes[v_id].adjacencies:
+                w_id = adj.to_vertex().id
+                if self.edge_to[w_id] is adj and w_id not in affected:
+                    affected.add(w_id)
+                    stack.append(w_id)
+
+        for v_id in affected:
+            self.dist_to[v_id] = math.inf
+            self.edge_to[v_id] = None
+
+        pq = IndexMinPriorityQueue()
+
+        for v_id in affected:
+            for incoming in self.graph.incoming_edges(v_id):
+                u_id = incoming.from_vertex().id
+
+                if u_id not in affected and self.dist_to[u_id] + incoming.weight < self.dist_to[v_id]:
+                    self.dist_to[v_id] = self.dist_to[u_id] + incoming.weight
+                    self.edge_to[v_id] = incoming
+
+            if self.dist_to[v_id] != math.inf:
+                pq.add_to_queue(v_id, self.dist_to[v_id])
+
+        return len(affected | self._propagated_vertexes(pq))
+
+    def _propagate(self, pq: IndexMinPriorityQueue):
+        return len(self._propagated_vertexes(pq))
+
+    def _propagated_vertexes(self, pq: IndexMinPriorityQueue):
+        """
+        Dijkstra from vertexes in queue, only over vertexes which distances become shorter
+        :return: set of ids of settled vertexes
+        """
+        settled = set()
+
+        while not pq.is_empty():
+            v_id = pq.pop_min()
+            settled.add(v_id)
+
+            for edge in self.graph.vertexes[v_id].adjacencies:
+                w_id = edge.to_vertex().id
+                dist = self.dist_to[v_id] + edge.weight
+
+                if dist < self.dist_to[w_id]:
+                    self.dist_to[w_id] = dist
+                    self.edge_to[w_id] = edge
+
+                    if pq.contains(w_id):
+                        pq.update_priority(w_id, dist)
+                    else:
+                        pq.add_to_queue(w_id, dist)
+
+        return settled
+
+
+if __name__ == '__main__':
+    from random import randint, random, choice
+
+    from education_part.graphs import edge_weight_digraph_from_data
+
+    g_data = [
+        '8', '0 1 5.0', '0 4 9.0', '0 7 8.0', '1 2 12.0', '1 3 15.0', '1 7 4.0', '2 3 3.0', '2 6 11.0',
+        '3 6 9.0', '4 5 4.0', '4 6 20.0', '4 7 5.0', '5 2 1.0', '5 6 13.0', '7 5 6.0', '7 2 7.0',
+    ]
+    g = edge_weight_digraph_from_data(g_data, EdgeWeightedDigraph)
+    dsp = DynamicShortestPath(g, g.vertexes[0])
+    print(f'Path to 6: {dsp.shortest_path_to(g.vertexes[6])}')
+
+    g.add_edge(Diedge(g.vertexes[0], g.vertexes[2], 3.0))
+    print(f'After adding 0 -> 2 (3.0): {dsp.shortest_path_to(g.vertexes[6])}, touched {dsp.last_update_touched}')
+
+    g.update_weight(g.edges[-1], 30.0)
+    print(f'After increase to 30.0: {dsp.shortest_path_to(g.vertexes[6])}, touched {dsp.last_update_touched}')
+
+    print('\n--- Random updates ---')
+    size = 2_000
+    big = EdgeWeightedDigraph(size)
+    for _ in range(size * 4):
+        big.add_edge(Diedge(big.vertexes[randint(0, size - 1)], big.vertexes[randint(0, size - 1)], random()))
+
+    dsp = DynamicShortestPath(big, big.vertexes[0])
+    for _ in range(200):
+        big.update_weight(choice(big.edges), random())
+    print(f'Updates: {dsp.updates}, vertexes touched on average: {dsp.total_touched / dsp.updates}')
+
+    if dsp.dist_to != DijkstraShortestPath(big, big.vertexes[0]).dist_to:
+        print('Distances are different!!!')
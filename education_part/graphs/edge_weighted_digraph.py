@@ -1,15 +1,25 @@
 import math
+from array import array
 
 from education_part.data_structures import IndexMinPriorityQueue
-from education_part.graphs import Vertex, Diedge
+from education_part.graphs import (
+    Vertex, Diedge, depth_first_walk, POSTORDER, check_vertex_id, check_vertex_ids, vertex_ids_typecode, path_to_root,
+    tree_depths, tree_paths,
+)
 
 
 class EdgeWeightedDigraph:
+    directed = True
+    weighted = True
+
     def __init__(self, vertex_num):
         self.vertexes_number = vertex_num
         self.vertexes = [Vertex(v_id) for v_id in range(vertex_num)]
         self.edges_number = 0
         self.edges = []
+        self.version = 0  # changes on every modification of the graph
+        self.listeners = []
+        self._incoming_edges = None
 
     def __repr__(self):
         str_repr = ''
@@ -23,15 +33,103 @@ class EdgeWeightedDigraph:
         v1 = edge.from_vertex()
         v2 = edge.to_vertex()
 
-        if v1 not in self.vertexes:
-            raise IndexError(v1.id)
-        if v2 not in self.vertexes:
-            raise IndexError(v2.id)
+        self._check_vertex(v1)
+        self._check_vertex(v2)
 
         self.edges.append(edge)
         self.edges_number += 1
+        self.version += 1
         v1.adjacencies.append(edge)
 
+        if self._incoming_edges is not None:
+            self._incoming_edges[v2.id].append(edge)
+
+        for listener in self.listeners:
+            listener(edge, None)
+
+    def add_edges(self, ids_1, ids_2, weights):
+        """
+        Add many edges at once
+        :param ids_1: sequence of ids of vertexes edges start from
+        :param ids_2: sequence of ids of vertexes edges go to
+        :param weights: sequence of weights of edges
+        :return: None
+        """
+        if not len(ids_1) == len(ids_2) == len(weights):
+            raise ValueError('ids_1, ids_2 and weights have different lengths')
+
+        check_vertex_ids(ids_1, self.vertexes_number)
+        check_vertex_ids(ids_2, self.vertexes_number)
+
+        vertexes = self.vertexes
+        first_new = len(self.edges)
+        for id_1, id_2, weight in zip(ids_1, ids_2, weights):
+            edge = Diedge(vertexes[id_1], vertexes[id_2], weight)
+            self.edges.append(edge)
+            vertexes[id_1].adjacencies.append(edge)
+
+            if self._incoming_edges is not None:
+                self._incoming_edges[id_2].append(edge)
+
+        self.edges_number += len(ids_1)
+        self.version += len(ids_1)
+
+        if self.listeners:
+            for edge in self.edges[first_new:]:
+                for listener in self.listeners:
+                    listener(edge, None)
+
+    def _check_vertex(self, vertex: Vertex):
+        """
+        Vertex has to be the object of this graph, not just equal one - check by id and identity instead of search
+        """
+        check_vertex_id(vertex.id, self.vertexes_number)
+
+        if self.vertexes[vertex.id] is not vertex:
+            raise IndexError(vertex.id)
+
+    def update_weight(self, edge: Diedge, new_weight: float):
+        """
+        Change weight of edge which is already in the graph
+        :param edge: edge of the graph
+        :param new_weight: new weight of the edge
+        :return: None
+        """
+        old_weight = edge.weight
+        edge.weight = new_weight
+        self.version += 1
+
+        for listener in self.listeners:
+            listener(edge, old_weight)
+
+    def subscribe(self, listener):
+        """
+        Subscribe to changes of the graph.
+        Listener is called as listener(edge, old_weight) after edge is added (old_weight is None)
+        or its weight is updated.
+        :param listener: callable
+        :return: None
+        """
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
+
+    def incoming_edges(self, v_id: int):
+        """
+        Reverse view of the graph: edges which go to given vertex.
+        Index of incoming edges is built on first call and then kept up to date by add_edge.
+        :param v_id: id of vertex
+        :return: list of Diedge objects
+        """
+        if self._incoming_edges is None:
+            self._incoming_edges = [[] for _ in range(self.vertexes_number)]
+
+            for edge in self.edges:
+                self._incoming_edges[edge.to_vertex().id].append(edge)
+
+        return self._incoming_edges[v_id]
+
 
 class TopologicalSortEWD:
     def __init__(self, graph: EdgeWeightedDigraph):
@@ -43,14 +141,19 @@ class TopologicalSortEWD:
             if not self.marked[vertex.id]:
                 self.__depth_first_paths(vertex=vertex)
 
-    def __depth_first_paths(self, vertex):
-        self.marked[vertex.id] = True
+        self.path.reverse()
 
-        for adj in self.graph.vertexes[vertex.id].adjacencies:
-            if not self.marked[adj.to_vertex().id]:
-                self.__depth_first_paths(adj.to_vertex())
+    def __depth_first_paths(self, vertex):
+        walk = depth_first_walk(
+            adjacencies=lambda v_id: self.graph.vertexes[v_id].adjacencies,
+            root_id=vertex.id,
+            marked=self.marked,
+            neighbour=lambda edge: edge.to_vertex().id,
+        )
 
-        self.path.insert(0, vertex)
+        for event, v_id, _ in walk:
+            if event == POSTORDER:
+                self.path.append(self.graph.vertexes[v_id])
 
 
 class ShortestPath:
@@ -58,22 +161,75 @@ class ShortestPath:
     edge_to: list
     dist_to: list
 
+    def _parent_id(self, v_id: int):
+        edge = self.edge_to[v_id]
+
+        if edge is None:
+            return None
+
+        return edge.from_vertex().id
+
+    def _distance(self, v_id: int):
+        return self.dist_to[v_id]
+
+    def _vertexes_number(self):
+        return len(self.dist_to)
+
+    def path_to_source(self, v_id: int):
+        """
+        :param v_id: id of vertex
+        :return: generator of vertexes' ids from given one back to the source, empty for unreachable vertex
+        """
+        if self._distance(v_id) == math.inf:
+            return iter(())
+
+        return path_to_root(self._parent_id, v_id)
+
     def shortest_path_to(self, destination_vertex: Vertex):
-        if destination_vertex == self.source_vertex:
+        """
+        :param destination_vertex: Vertex object
+        :return: distance and list of vertexes' ids on the path, (0, None) for source,
+                 (math.inf, None) for unreachable vertex
+        """
+        if destination_vertex.id == self.source_vertex.id:
             return 0, None
 
-        dist = self.dist_to[destination_vertex.id]
-        path = [destination_vertex.id]
-        edge = self.edge_to[destination_vertex.id]
+        dist = self._distance(destination_vertex.id)
 
-        while edge.from_vertex() != self.source_vertex:
-            path.insert(0, edge.from_vertex().id)
-            edge = self.edge_to[edge.from_vertex().id]
-
-        path.insert(0, edge.from_vertex().id)
+        if dist == math.inf:
+            return dist, None
 
+        path = list(self.path_to_source(destination_vertex.id))
+        path.reverse()
         return dist, path
 
+    def paths_to(self, vertex_ids):
+        """
+        Shortest paths to many vertexes sharing common prefixes
+        :param vertex_ids: ids of vertexes
+        :return: dict: vertex id -> list of vertexes' ids from source, None for unreachable vertexes
+        """
+        return tree_paths(self._parent_id, self.source_vertex.id, vertex_ids)
+
+    def path_tree(self):
+        """
+        Whole shortest paths tree in compact form
+        :return: (array of parents' ids, -1 for source and unreachable vertexes;
+                  array of numbers of edges from source, -1 for unreachable vertexes;
+                  array of distances from source, math.inf for unreachable vertexes)
+        """
+        vertex_num = self._vertexes_number()
+        parent = array(vertex_ids_typecode(vertex_num), [-1]) * vertex_num
+        dist = array('d', [math.inf]) * vertex_num
+
+        for v_id in range(vertex_num):
+            dist[v_id] = self._distance(v_id)
+
+            if (parent_id := self._parent_id(v_id)) is not None:
+                parent[v_id] = parent_id
+
+        return parent, tree_depths(parent, self.source_vertex.id), dist
+
 
 class DijkstraShortestPath(ShortestPath):
     def __init__(self, graph: EdgeWeightedDigraph, source_vertex: Vertex):
@@ -84,10 +240,10 @@ class DijkstraShortestPath(ShortestPath):
         self.pq = IndexMinPriorityQueue()
 
         self.dist_to[self.source_vertex.id] = 0
-        self.pq.add_to_queue(self.source_vertex, 0)
+        self.pq.add_to_queue(self.source_vertex.id, 0)
 
         while not self.pq.is_empty():
-            vertex = self.pq.pop_min()
+            vertex = self.graph.vertexes[self.pq.pop_min()]
             for edge in vertex.adjacencies:
                 self._relax(edge)
 
@@ -99,10 +255,10 @@ class DijkstraShortestPath(ShortestPath):
             self.dist_to[v2.id] = self.dist_to[v1.id] + edge.weight
             self.edge_to[v2.id] = edge
 
-            if v2 in self.pq.items:
-                self.pq.update_priority(v2, self.dist_to[v2.id])
+            if self.pq.contains(v2.id):
+                self.pq.update_priority(v2.id, self.dist_to[v2.id])
             else:
-                self.pq.add_to_queue(v2, self.dist_to[v2.id])
+                self.pq.add_to_queue(v2.id, self.dist_to[v2.id])
 
 
 class TopologicalShortestPath(ShortestPath):
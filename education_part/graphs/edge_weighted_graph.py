@@ -1,11 +1,21 @@
+import heapq
+import math
+from array import array
 from copy import copy
+from multiprocessing import Pool
 
-from education_part.data_structures import MinPriorityQueue
-from education_part.graphs import Vertex, Edge
-from education_part.connectivity import QuickUnion
+from education_part.data_structures import MinPriorityQueue, IndexMinPriorityQueue
+from education_part.graphs import Vertex, Edge, vertex_ids_typecode, check_vertex_id, check_vertex_ids
+from education_part.connectivity import QuickUnionRanked
+
+# Edges of the graph in worker process of BoruvkaMST pool
+_worker_edges = None
 
 
 class EdgeWeightedGraph:
+    directed = False
+    weighted = True
+
     def __init__(self, vertex_num):
         self.vertexes_number = vertex_num
         self.vertexes = [Vertex(v_id) for v_id in range(vertex_num)]
@@ -24,23 +34,57 @@ class EdgeWeightedGraph:
         v1 = edge.either_vertex()
         v2 = edge.other_vertex(v1)
 
-        if v1 not in self.vertexes:
-            raise IndexError(v1.id)
-        if v2 not in self.vertexes:
-            raise IndexError(v2.id)
+        self._check_vertex(v1)
+        self._check_vertex(v2)
 
         self.edges.append(edge)
         self.edges_number += 1
         v1.adjacencies.append(edge)
 
-        if v1 != v2:
+        if v1 is not v2:
             v2.adjacencies.append(edge)
 
+    def add_edges(self, ids_1, ids_2, weights):
+        """
+        Add many edges at once
+        :param ids_1: sequence of ids of first vertexes of edges
+        :param ids_2: sequence of ids of second vertexes of edges
+        :param weights: sequence of weights of edges
+        :return: None
+        """
+        if not len(ids_1) == len(ids_2) == len(weights):
+            raise ValueError('ids_1, ids_2 and weights have different lengths')
+
+        check_vertex_ids(ids_1, self.vertexes_number)
+        check_vertex_ids(ids_2, self.vertexes_number)
+
+        vertexes = self.vertexes
+        for id_1, id_2, weight in zip(ids_1, ids_2, weights):
+            v1 = vertexes[id_1]
+            v2 = vertexes[id_2]
+            edge = Edge(v1, v2, weight)
+            self.edges.append(edge)
+            v1.adjacencies.append(edge)
+
+            if id_1 != id_2:
+                v2.adjacencies.append(edge)
+
+        self.edges_number += len(ids_1)
+
+    def _check_vertex(self, vertex: Vertex):
+        """
+        Vertex has to be the object of this graph, not just equal one - check by id and identity instead of search
+        """
+        check_vertex_id(vertex.id, self.vertexes_number)
+
+        if self.vertexes[vertex.id] is not vertex:
+            raise IndexError(vertex.id)
+
 
 class KruskalMST:
     def __init__(self, graph: EdgeWeightedGraph):
         self.graph = graph
-        self.quick_union = QuickUnion(self.graph.vertexes_number)
+        self.quick_union = QuickUnionRanked(self.graph.vertexes_number)
         self.edges = sorted(copy(self.graph.edges), reverse=True)
         self.mst = []
 
@@ -65,6 +109,73 @@ class KruskalMST:
         return weight
 
 
+def edges_arrays(graph: EdgeWeightedGraph):
+    """
+    Edges of the graph as struct of arrays: edge with index "i" connects ids_1[i] and ids_2[i] and has weights[i]
+    :param graph: EdgeWeightedGraph object
+    :return: (ids_1, ids_2, weights)
+    """
+    ids_1 = array(vertex_ids_typecode(graph.vertexes_number))
+    ids_2 = array(vertex_ids_typecode(graph.vertexes_number))
+    weights = array('d')
+
+    for edge in graph.edges:
+        v1 = edge.either_vertex()
+        ids_1.append(v1.id)
+        ids_2.append(edge.other_vertex(v1).id)
+        weights.append(edge.weight)
+
+    return ids_1, ids_2, weights
+
+
+class ArrayKruskalMST:
+    """
+    Kruskal over parallel arrays of edges instead of sorting Edge objects with rich comparisons.
+    Edges are ordered by indirect sort of weights array, or, if lazy, popped one by one from heap
+    of (weight, index) pairs - then only edges lighter than the heaviest edge of the tree are ever ordered.
+    Scan stops as soon as V - 1 edges are accepted. Union-find is ranked and path compressed.
+    """
+    def __init__(self, graph: EdgeWeightedGraph, lazy: bool = False):
+        self.graph = graph
+        self.quick_union = QuickUnionRanked(self.graph.vertexes_number)
+        self.edges_ids_1, self.edges_ids_2, self.weights = edges_arrays(self.graph)
+        self.mst = []
+
+        if lazy:
+            order = self._lazy_order()
+        else:
+            order = sorted(range(len(self.weights)), key=self.weights.__getitem__)
+
+        for edge_index in order:
+            if len(self.mst) >= self.graph.vertexes_number - 1:
+                break
+
+            v1_id = self.edges_ids_1[edge_index]
+            v2_id = self.edges_ids_2[edge_index]
+
+            if not self.quick_union.is_connected(v1_id, v2_id):
+                self.quick_union.union(v1_id, v2_id)
+                self.mst.append(self.graph.edges[edge_index])
+
+    def _lazy_order(self):
+        heap = list(zip(self.weights, range(len(self.weights))))
+        heapq.heapify(heap)
+
+        while heap:
+            yield heapq.heappop(heap)[1]
+
+    def mst_edges(self):
+        return self.mst
+
+    def mst_weight(self):
+        weight = 0
+
+        for edge in self.mst_edges():
+            weight += edge.weight
+
+        return weight
+
+
 class LazyPrimMST:
     def __init__(self, graph: EdgeWeightedGraph):
         self.graph = graph
@@ -108,6 +219,172 @@ class LazyPrimMST:
         return weight
 
 
+class PrimMST:
+    """
+    Eager Prim: for every vertex out of the tree only the lightest edge connecting it to the tree is kept
+    in indexed priority queue, so queue holds at most V entries.
+    Disconnected graph gets minimum spanning forest.
+    """
+    def __init__(self, graph: EdgeWeightedGraph):
+        self.graph = graph
+        self.mst = []
+        self.marked = [False for _ in range(self.graph.vertexes_number)]
+        self.edge_to = [None for _ in range(self.graph.vertexes_number)]
+        self.dist_to = [math.inf for _ in range(self.graph.vertexes_number)]
+        self.pq = IndexMinPriorityQueue()
+
+        for vertex in self.graph.vertexes:
+            if self.marked[vertex.id]:
+                continue
+
+            self.dist_to[vertex.id] = 0
+            self.pq.add_to_queue(vertex.id, 0)
+
+            while not self.pq.is_empty():
+                self._visit(self.graph.vertexes[self.pq.pop_min()])
+
+    def _visit(self, vertex):
+        self.marked[vertex.id] = True
+
+        if self.edge_to[vertex.id] is not None:
+            self.mst.append(self.edge_to[vertex.id])
+
+        for edge in vertex.adjacencies:
+            other_id = edge.other_vertex(vertex).id
+
+            if self.marked[other_id] or edge.weight >= self.dist_to[other_id]:
+                continue
+
+            self.edge_to[other_id] = edge
+            self.dist_to[other_id] = edge.weight
+
+            if self.pq.contains(other_id):
+                self.pq.update_priority(other_id, edge.weight)
+            else:
+                self.pq.add_to_queue(other_id, edge.weight)
+
+    def mst_edges(self):
+        return self.mst
+
+    def mst_weight(self):
+        weight = 0
+
+        for edge in self.mst_edges():
+            weight += edge.weight
+
+        return weight
+
+
+def _attach_boruvka_worker(edges_ids_1, edges_ids_2, weights):
+    global _worker_edges
+    _worker_edges = edges_ids_1, edges_ids_2, weights
+
+
+def _cheapest_edges(edges_ids_1, edges_ids_2, weights, components, start: int, end: int):
+    """
+    Lightest edge leaving every component among edges with indexes from start to end.
+    Ties are broken by index of edge, so all components agree on the order of edges and no cycle appears.
+    :return: dict: component id -> (weight, edge index)
+    """
+    cheapest = {}
+
+    for edge_index in range(start, end):
+        component_1 = components[edges_ids_1[edge_index]]
+        component_2 = components[edges_ids_2[edge_index]]
+
+        if component_1 == component_2:
+            continue
+
+        candidate = (weights[edge_index], edge_index)
+
+        if candidate < cheapest.get(component_1, (math.inf, 0)):
+            cheapest[component_1] = candidate
+        if candidate < cheapest.get(component_2, (math.inf, 0)):
+            cheapest[component_2] = candidate
+
+    return cheapest
+
+
+def _worker_cheapest_edges(task):
+    components, start, end = task
+    return _cheapest_edges(*_worker_edges, components, start, end)
+
+
+class BoruvkaMST:
+    """
+    Boruvka: every pass finds the lightest edge leaving each component and adds all of them to the tree,
+    so number of components at least halves on every pass.
+    Edges are kept as parallel arrays (ids of vertexes and weights). Pass is one scan over these arrays,
+    which may be split between pool of processes, each scanning its shard of edges.
+    Disconnected graph gets minimum spanning forest.
+    """
+    def __init__(self, graph: EdgeWeightedGraph, processes: int = None):
+        self.graph = graph
+        self.mst = []
+        self.passes = 0
+        self.edges_ids_1, self.edges_ids_2, self.weights = edges_arrays(self.graph)
+
+        self.quick_union = QuickUnionRanked(self.graph.vertexes_number)
+
+        if processes is None:
+            self._run(pool=None, shards=1)
+            return
+
+        initargs = (self.edges_ids_1, self.edges_ids_2, self.weights)
+        with Pool(processes, initializer=_attach_boruvka_worker, initargs=initargs) as pool:
+            self._run(pool=pool, shards=processes)
+
+    def _run(self, pool, shards: int):
+        edges_number = len(self.weights)
+        shard_size = math.ceil(edges_number / shards) or 1
+
+        while len(self.mst) < self.graph.vertexes_number - 1:
+            components = array(
+                self.edges_ids_1.typecode,
+                map(self.quick_union.get_root, range(self.graph.vertexes_number)),
+            )
+
+            if pool is None:
+                cheapest = _cheapest_edges(
+                    self.edges_ids_1, self.edges_ids_2, self.weights, components, 0, edges_number,
+                )
+            else:
+                tasks = [
+                    (components, start, min(start + shard_size, edges_number))
+                    for start in range(0, edges_number, shard_size)
+                ]
+                cheapest = {}
+
+                for shard_cheapest in pool.imap_unordered(_worker_cheapest_edges, tasks):
+                    for component, candidate in shard_cheapest.items():
+                        if candidate < cheapest.get(component, (math.inf, 0)):
+                            cheapest[component] = candidate
+
+            if not cheapest:
+                break
+
+            self.passes += 1
+
+            for _, edge_index in cheapest.values():
+                v1_id = self.edges_ids_1[edge_index]
+                v2_id = self.edges_ids_2[edge_index]
+
+                if not self.quick_union.is_connected(v1_id, v2_id):
+                    self.quick_union.union(v1_id, v2_id)
+                    self.mst.append(self.graph.edges[edge_index])
+
+    def mst_edges(self):
+        return self.mst
+
+    def mst_weight(self):
+        weight = 0
+
+        for edge in self.mst_edges():
+            weight += edge.weight
+
+        return weight
+
+
 if __name__ == '__main__':
     from education_part.graphs import edge_weight_graph_from_data
 
@@ -156,3 +433,53 @@ if __name__ == '__main__':
 
     print('-' * 50)
     print('Lazy Prim Minimum Spain Trees:')
+
+    print('-' * 50)
+    print('Eager Prim Minimum Spain Trees:')
+    eager_prim_mst = PrimMST(g)
+    print(f'MST weight: {eager_prim_mst.mst_weight()}')
+
+    print('-' * 50)
+    print('Boruvka Minimum Spain Trees:')
+    boruvka_mst = BoruvkaMST(g)
+    print(f'MST weight: {boruvka_mst.mst_weight()}')
+    print(f'MST weight with 2 processes: {BoruvkaMST(g, processes=2).mst_weight()}')
+
+    print('-' * 50)
+    import time
+    from random import randint, random
+
+    size = 2_000
+    big = EdgeWeightedGraph(size)
+    for i in range(1, size):
+        big.add_edge(Edge(big.vertexes[i], big.vertexes[randint(0, i - 1)], random()))
+    for _ in range(size * 5):
+        big.add_edge(Edge(big.vertexes[randint(0, size - 1)], big.vertexes[randint(0, size - 1)], random()))
+
+    for algorithm in (KruskalMST, ArrayKruskalMST, LazyPrimMST, PrimMST, BoruvkaMST):
+        start = time.time()
+        mst = algorithm(big)
+        print(f'{algorithm.__name__}, weight {round(mst.mst_weight(), 5)}:'.ljust(40), end='')
+        print(f' {round(time.time() - start, 5)} seconds')
+
+    start = time.time()
+    mst = ArrayKruskalMST(big, lazy=True)
+    print(f'ArrayKruskalMST lazy, weight {round(mst.mst_weight(), 5)}:'.ljust(40), end='')
+    print(f' {round(time.time() - start, 5)} seconds')
+
+    print('-' * 50)
+    edges_num = 500_000
+    ids_1 = array('q', (randint(0, size - 1) for _ in range(edges_num)))
+    ids_2 = array('q', (randint(0, size - 1) for _ in range(edges_num)))
+    weights = array('d', (random() for _ in range(edges_num)))
+
+    start = time.time()
+    one_by_one = EdgeWeightedGraph(size)
+    for id_1, id_2, weight in zip(ids_1, ids_2, weights):
+        one_by_one.add_edge(Edge(one_by_one.vertexes[id_1], one_by_one.vertexes[id_2], weight))
+    print(f'{edges_num} edges by add_edge:'.ljust(40), f'{round(time.time() - start, 5)} seconds')
+
+    start = time.time()
+    bulk = EdgeWeightedGraph(size)
+    bulk.add_edges(ids_1, ids_2, weights)
+    print(f'{edges_num} edges by add_edges:'.ljust(40), f'{round(time.time() - start, 5)} seconds')
@@ -1,7 +1,96 @@
+import math
+import os
+import struct
+from array import array
 from dataclasses import dataclass, field
 
 
-@dataclass
+def vertex_ids_typecode(vertex_num: int):
+    """
+    Smallest array typecode able to hold ids of all vertexes of the graph.
+    :param vertex_num: number of vertexes in graph
+    :return: str: array typecode
+    """
+    if vertex_num < 2 ** 31:
+        return 'i'
+    return 'q'
+
+
+# typecodes of the same kind, so array saved with item size of other platform is read by native typecode
+TYPECODES_KINDS = ('bhilq', 'BHILQ', 'fd')
+ARRAY_HEADER = struct.Struct('<cB')  # typecode, size of item in bytes
+
+
+def native_typecode(typecode: str, itemsize: int):
+    """
+    Typecode of the same kind as given one with given item size on this platform
+    :param typecode: typecode of saved array
+    :param itemsize: item size of saved array in bytes
+    :return: str: typecode
+    """
+    for kind in TYPECODES_KINDS:
+        if typecode in kind:
+            for native in kind:
+                if array(native).itemsize == itemsize:
+                    return native
+
+    raise ValueError(f'Array of typecode "{typecode}" with {itemsize} bytes items is not supported.')
+
+
+def write_array(file, part: array):
+    """
+    Write array to binary file with its typecode and item size, items are in native byte order
+    :param file: file opened for binary writing
+    :param part: array
+    :return: None
+    """
+    file.write(ARRAY_HEADER.pack(part.typecode.encode(), part.itemsize))
+    part.tofile(file)
+
+
+def read_array(file, size: int, swap: bool):
+    """
+    Read array written by write_array, possibly on another platform
+    :param file: file opened for binary reading
+    :param size: number of items
+    :param swap: True if file is saved with another byte order
+    :return: array
+    """
+    typecode, itemsize = ARRAY_HEADER.unpack(file.read(ARRAY_HEADER.size))
+    part = array(native_typecode(typecode.decode(), itemsize))
+    part.fromfile(file, size)
+
+    if swap:
+        part.byteswap()
+
+    return part
+
+
+def check_vertex_id(v_id: int, vertex_num: int):
+    """
+    Raise IndexError if there is no vertex with such id in graph
+    :param v_id: id of vertex
+    :param vertex_num: number of vertexes in graph
+    :return: None
+    """
+    if not 0 <= v_id < vertex_num:
+        raise IndexError(v_id)
+
+
+def check_vertex_ids(ids, vertex_num: int):
+    """
+    Check many ids at once: only the smallest and the biggest ids are compared with bounds,
+    loop to find wrong id runs only if there is one.
+    :param ids: sequence of ids of vertexes
+    :param vertex_num: number of vertexes in graph
+    :return: None
+    """
+    if len(ids) and (min(ids) < 0 or max(ids) >= vertex_num):
+        for v_id in ids:
+            check_vertex_id(v_id, vertex_num)
+
+
+@dataclass(slots=True)
 class Vertex:
     id: int
     adjacencies: list = field(default_factory=list)
@@ -9,6 +98,8 @@ class Vertex:
 
 
 class Edge:
+    __slots__ = ('v1', 'v2', 'weight')
+
     def __init__(self, v1: Vertex, v2: Vertex, weight):
         self.v1 = v1
         self.v2 = v2
@@ -54,12 +145,17 @@ class Edge:
         return self.v1
 
     def other_vertex(self, vertex: Vertex):
-        if vertex == self.v1:
+        if vertex is self.v1:
             return self.v2
         return self.v1
 
+    def compact(self):
+        return CompactEdge(self.v1.id, self.v2.id, self.weight)
+
 
 class Diedge(Edge):
+    __slots__ = ()
+
     def __repr__(self):
         return f'{self.v1.id: <3}--|{self.weight: ^6}|--> {self.v2.id: >3}'
 
@@ -69,11 +165,45 @@ class Diedge(Edge):
     def to_vertex(self):
         return self.v2
 
+    def compact(self):
+        return CompactDiedge(self.v1.id, self.v2.id, self.weight)
+
+
+class CompactEdge(Edge):
+    """
+    Edge which keeps ids of vertexes instead of Vertex objects, so it does not hold the graph in memory
+    and is cheap to pickle. Methods take and return vertexes' ids.
+    """
+    __slots__ = ()
+
+    def __init__(self, v1_id: int, v2_id: int, weight):
+        super().__init__(v1_id, v2_id, weight)
+
+    def __repr__(self):
+        return f'{self.v1: <3}--|{self.weight: ^6}|-- {self.v2: >3}'
+
+    def other_vertex(self, v_id: int):
+        if v_id == self.v1:
+            return self.v2
+        return self.v1
+
+    def compact(self):
+        return self
+
+
+class CompactDiedge(CompactEdge, Diedge):
+    __slots__ = ()
+
+    def __repr__(self):
+        return f'{self.v1: <3}--|{self.weight: ^6}|--> {self.v2: >3}'
+
 
 class Graph:
     vertexes: list
     vertexes_number: int
     edges_number: int
+    directed: bool
+    weighted = False
 
     def __str__(self):
         return self.__repr__()
@@ -81,103 +211,383 @@ class Graph:
     def add_edge(self, id_1: int, id_2: int):
         raise NotImplemented
 
+    def adjacencies(self, v_id: int):
+        """
+        Get ids of vertexes adjacent to given one.
+        All graph algorithms walk the graph through this method, so they work with any graph backend.
+        :param v_id: id of vertex
+        :return: iterable of vertexes' ids
+        """
+        return self.vertexes[v_id].adjacencies
+
+    def degree(self, v_id: int):
+        return len(self.vertexes[v_id].adjacencies)
+
+    def degree_histogram(self):
+        """
+        Number of vertexes of every degree: histogram[d] is number of vertexes with degree d,
+        so the last item is number of vertexes with max degree.
+        Graphs which maintain histogram return its copy, so caller may change it.
+        :return: list of ints
+        """
+        histogram = [0]
+
+        for v_id in range(self.vertexes_number):
+            degree = self.degree(v_id)
+
+            if degree >= len(histogram):
+                histogram.extend([0] * (degree + 1 - len(histogram)))
+            histogram[degree] += 1
+
+        return histogram
+
+    def self_loops_number(self):
+        self_loops_number = 0
+
+        for v_id in range(self.vertexes_number):
+            for adj in self.adjacencies(v_id):
+                if adj == v_id:
+                    self_loops_number += 1
+
+        return self_loops_number
+
+    def _start_degree_statistics(self):
+        """
+        Mutable graphs keep degree histogram and number of self loops up to date on every new edge.
+        Degrees only grow, so histogram only grows too and its last item is never zero.
+        """
+        self._degree_histogram = [self.vertexes_number]
+        self._self_loops_number = 0
+
+    def _degrees_changing(self, v_ids):
+        """
+        Take vertexes out of histogram before their adjacencies are changed
+        """
+        for v_id in v_ids:
+            self._degree_histogram[len(self.vertexes[v_id].adjacencies)] -= 1
+
+    def _degrees_changed(self, v_ids):
+        """
+        Put vertexes back to histogram with their new degrees
+        """
+        histogram = self._degree_histogram
+
+        for v_id in v_ids:
+            degree = len(self.vertexes[v_id].adjacencies)
+
+            if degree >= len(histogram):
+                histogram.extend([0] * (degree + 1 - len(histogram)))
+            histogram[degree] += 1
+
+
+PREORDER = 0
+POSTORDER = 1
+NON_TREE_EDGE = 2
+
+
+def depth_first_walk(adjacencies, root_id: int, marked: list, neighbour=None):
+    """
+    Depth first traversal with explicit stack shared by all DFS based algorithms.
+    Vertexes are visited in the same order as in recursive realisation,
+    but depth of the graph is limited only by memory, not by interpreter recursion limit.
+    Generator yields events:
+        (PREORDER, vertex_id, parent_id) - vertex is visited first time, parent_id is None for root
+        (POSTORDER, vertex_id, parent_id) - all adjacencies of vertex are processed
+        (NON_TREE_EDGE, vertex_id, adjacency_id) - edge to already marked vertex
+    :param adjacencies: function which returns adjacencies of vertex by its id
+    :param root_id: id of vertex to start from
+    :param marked: list of visited flags, updated in place
+    :param neighbour: function to get vertex id from adjacency (for graphs which store edges), optional
+    :return: generator of (event, vertex_id, other_id) tuples
+    """
+    marked[root_id] = True
+    yield PREORDER, root_id, None
+    stack = [(root_id, None, iter(adjacencies(root_id)))]
+
+    while stack:
+        vertex_id, parent_id, adjacencies_iter = stack[-1]
+
+        for adj in adjacencies_iter:
+            if neighbour is not None:
+                adj = neighbour(adj)
+
+            if not marked[adj]:
+                marked[adj] = True
+                yield PREORDER, adj, vertex_id
+                stack.append((adj, vertex_id, iter(adjacencies(adj))))
+                break
+
+            yield NON_TREE_EDGE, vertex_id, adj
+        else:
+            stack.pop()
+            yield POSTORDER, vertex_id, parent_id
+
 
 class TypicalGraphProcessing:
     @staticmethod
     def vertex_degree(graph: Graph, v_id: int):
-        return len(graph.vertexes[v_id].adjacencies)
+        return graph.degree(v_id)
 
     @staticmethod
     def vertex_adjacencies(graph: Graph, v_id: int):
-        return graph.vertexes[v_id].adjacencies
+        return graph.adjacencies(v_id)
 
     @staticmethod
     def max_degree(graph: Graph):
-        max_degree = 0
-
-        for v in graph.vertexes:
-            if len(v.adjacencies) > max_degree:
-                max_degree = len(v.adjacencies)
-
-        return max_degree
+        return len(graph.degree_histogram()) - 1
 
     @staticmethod
     def average_degree(graph: Graph):
-        return graph.edges_number / len(graph.vertexes)
+        return graph.edges_number / graph.vertexes_number
 
     @staticmethod
     def self_loops_number(graph: Graph):
-        self_loops_number = 0
+        return graph.self_loops_number()
 
-        for v in graph.vertexes:
-            self_loops_number += v.adjacencies.count(v.id)
+    @staticmethod
+    def degree_histogram(graph: Graph):
+        return graph.degree_histogram()
+
+    @staticmethod
+    def degree_percentile(graph: Graph, percent: float):
+        """
+        Smallest degree which is not less than degrees of given percent of vertexes, O(max degree)
+        :param graph: graph object
+        :param percent: from 0 to 100
+        :return: int: degree
+        """
+        if not 0 <= percent <= 100:
+            raise ValueError(f'Percent has to be from 0 to 100, got {percent}.')
+
+        histogram = graph.degree_histogram()
+        rank = max(1, math.ceil(percent / 100 * graph.vertexes_number))
+        count = 0
+
+        for degree, vertexes_number in enumerate(histogram):
+            count += vertexes_number
+            if count >= rank:
+                return degree
+
+        return len(histogram) - 1
 
-        return self_loops_number
+
+def path_to_root(parent_id, vertex_id: int):
+    """
+    Lazy path in search tree: vertexes are yielded from given one up to the root
+    :param parent_id: function which returns id of parent of vertex in the tree, None for root
+    :param vertex_id: id of vertex path starts from
+    :return: generator of vertexes' ids
+    """
+    while vertex_id is not None:
+        yield vertex_id
+        vertex_id = parent_id(vertex_id)
+
+
+def tree_depths(parent: array, root_id: int):
+    """
+    Depth of every vertex in tree given by parent array.
+    Each vertex is climbed only until vertex with known depth, so the whole tree takes O(V).
+    :param parent: array of ids of parents, -1 for root and vertexes out of tree
+    :param root_id: id of root
+    :return: array of numbers of edges on the paths from root, -1 for vertexes out of tree
+    """
+    depth = array(parent.typecode, [-1]) * len(parent)
+    depth[root_id] = 0
+
+    for v_id in range(len(parent)):
+        chain = []
+
+        while depth[v_id] == -1 and parent[v_id] != -1:
+            chain.append(v_id)
+            v_id = parent[v_id]
+
+        if depth[v_id] == -1:
+            continue
+
+        v_depth = depth[v_id]
+        for w_id in reversed(chain):
+            v_depth += 1
+            depth[w_id] = v_depth
+
+    return depth
+
+
+def tree_paths(parent_id, root_id: int, vertex_ids):
+    """
+    Paths from root to many vertexes in two passes over the tree, each vertex of the tree is climbed once.
+    The first pass climbs from every vertex until already climbed one and remembers where climbs meet.
+    The second pass builds paths: only requested vertexes and meeting points keep their paths, path of vertex
+    is a copy of path of the nearest such ancestor extended by climbed part, so one path of length L takes O(L).
+    :param parent_id: function which returns id of parent of vertex in the tree, None for root and out of tree
+    :param root_id: id of root
+    :param vertex_ids: ids of vertexes to find paths to
+    :return: dict: vertex id -> list of vertexes' ids from root to the vertex, None for vertexes out of tree
+    """
+    vertex_ids = list(vertex_ids)
+    climbed = {root_id}
+    unreachable = set()
+    kept = set()
+
+    for vertex_id in vertex_ids:
+        chain = []
+        v_id = vertex_id
+
+        while v_id is not None and v_id not in climbed and v_id not in unreachable:
+            chain.append(v_id)
+            v_id = parent_id(v_id)
+
+        if v_id is None or v_id in unreachable:
+            unreachable.update(chain)
+            continue
+
+        climbed.update(chain)
+        kept.add(v_id)
+        kept.add(vertex_id)
+
+    paths = {root_id: [root_id]}
+    result = {}
+
+    for vertex_id in vertex_ids:
+        if vertex_id in unreachable:
+            result[vertex_id] = None
+            continue
+
+        chain = []
+        v_id = vertex_id
+
+        while v_id not in paths:
+            chain.append(v_id)
+            v_id = parent_id(v_id)
+
+        path = paths[v_id] + chain[::-1]
+        for index, w_id in enumerate(chain):
+            if w_id in kept:
+                paths[w_id] = path[:len(path) - index] if index else path
+
+        result[vertex_id] = paths[vertex_id]
+
+    return result
 
 
 class GraphFirstSearch:
+    """
+    Search tree from root: edge_to keeps id of previous vertex on the path from root
+    """
     marked: list
     edge_to: list
     root_id: int
 
     def has_path_to(self, vertex_id: int):
-        return self.marked[vertex_id]
+        return bool(self.marked[vertex_id])
+
+    def _parent_id(self, vertex_id: int):
+        if vertex_id == self.root_id or not self.has_path_to(vertex_id):
+            return None
+
+        return self.edge_to[vertex_id]
+
+    def path_to_root(self, vertex_id: int):
+        """
+        :param vertex_id: id of vertex
+        :return: generator of vertexes' ids from given one up to the root, empty for unreachable vertex
+        """
+        if not self.has_path_to(vertex_id):
+            return iter(())
+
+        return path_to_root(self._parent_id, vertex_id)
 
     def path_to(self, vertex_id: int):
         if not self.has_path_to(vertex_id):
             return None
 
-        path = []
-        while vertex_id != self.root_id:
-            path.insert(0, vertex_id)
-            vertex_id = self.edge_to[vertex_id]
-
-        path.insert(0, self.root_id)
+        path = list(self.path_to_root(vertex_id))
+        path.reverse()
         return path
 
+    def paths_to(self, vertex_ids):
+        """
+        Paths to many vertexes sharing common prefixes
+        :param vertex_ids: ids of vertexes
+        :return: dict: vertex id -> path as in path_to
+        """
+        return tree_paths(self._parent_id, self.root_id, vertex_ids)
+
+    def search_tree(self):
+        """
+        Whole search tree in compact form
+        :return: (array of parents' ids, -1 for root and unreachable vertexes;
+                  array of numbers of edges from root, -1 for unreachable vertexes)
+        """
+        vertex_num = len(self.edge_to)
+        parent = array(vertex_ids_typecode(vertex_num), [-1]) * vertex_num
+
+        for v_id in range(vertex_num):
+            if (parent_id := self._parent_id(v_id)) is not None:
+                parent[v_id] = parent_id
+
+        return parent, tree_depths(parent, self.root_id)
+
 
 class DepthFirstSearch(GraphFirstSearch):
     def __init__(self, graph: Graph, root_id: int):
-        self.marked = [False for _ in range(len(graph.vertexes))]
-        self.edge_to = [None for _ in range(len(graph.vertexes))]
+        self.marked = [False for _ in range(graph.vertexes_number)]
+        self.edge_to = [None for _ in range(graph.vertexes_number)]
         self.graph = graph
         self.root_id = root_id
 
         self.__depth_first_paths(vertex_id=self.root_id)
 
     def __depth_first_paths(self, vertex_id):
-        self.marked[vertex_id] = True
-
-        for adj in self.graph.vertexes[vertex_id].adjacencies:
-            if not self.marked[adj]:
-                self.__depth_first_paths(adj)
-                self.edge_to[adj] = vertex_id
+        for event, adj, parent_id in depth_first_walk(self.graph.adjacencies, vertex_id, self.marked):
+            if event == PREORDER and parent_id is not None:
+                self.edge_to[adj] = parent_id
 
 
 class BreadthFirstSearch(GraphFirstSearch):
+    """
+    Level synchronous breadth first search.
+    Whole level of vertexes (frontier) is expanded at once, so every vertex is queued and processed once: O(V + E).
+    Results are stored in compact typed arrays:
+        marked - 1 for reachable vertexes, 0 otherwise
+        edge_to - id of previous vertex on the path from root, -1 for root and unreachable vertexes
+        dist_to_root - number of edges on the path from root, -1 for unreachable vertexes
+    """
     def __init__(self, graph: Graph, root_id: int):
-        self.marked = [False for _ in range(len(graph.vertexes))]
-        self.edge_to = [None for _ in range(len(graph.vertexes))]
-        self.dist_to_root = [None for _ in range(len(graph.vertexes))]
+        self.marked = array('b', bytes(graph.vertexes_number))
+        self.edge_to = array(vertex_ids_typecode(graph.vertexes_number), [-1]) * graph.vertexes_number
+        self.dist_to_root = array(vertex_ids_typecode(graph.vertexes_number), [-1]) * graph.vertexes_number
         self.graph = graph
         self.root_id = root_id
 
         self.__breadth_first_paths(vertex_id=self.root_id)
 
     def __breadth_first_paths(self, vertex_id):
-        search_queue = [vertex_id]
-        self.marked[vertex_id] = True
-        self.dist_to_root[vertex_id] = 0
+        marked = self.marked
+        edge_to = self.edge_to
+        dist_to_root = self.dist_to_root
+        adjacencies = self.graph.adjacencies
+
+        marked[vertex_id] = 1
+        dist_to_root[vertex_id] = 0
+        frontier = [vertex_id]
+        distance = 0
 
-        while search_queue:
-            proceed_id = search_queue.pop()
+        while frontier:
+            distance += 1
+            next_frontier = []
 
-            for adj in self.graph.vertexes[proceed_id].adjacencies:
-                if not self.marked[adj]:
-                    search_queue.insert(0, adj)
-                    self.marked[adj] = True
-                    self.edge_to[adj] = proceed_id
-                    self.dist_to_root[adj] = self.dist_to_root[proceed_id] + 1
+            for proceed_id in frontier:
+                for adj in adjacencies(proceed_id):
+                    if not marked[adj]:
+                        marked[adj] = 1
+                        edge_to[adj] = proceed_id
+                        dist_to_root[adj] = distance
+                        next_frontier.append(adj)
+
+            frontier = next_frontier
+
+    def search_tree(self):
+        return array(self.edge_to.typecode, self.edge_to), array(self.dist_to_root.typecode, self.dist_to_root)
 
 
 def graph_from_data(data: list, graph_type):
@@ -236,3 +646,82 @@ def edge_weight_digraph_from_data(data: list, graph_type):
         g.add_edge(edge)
 
     return g
+
+
+DEFAULT_CHUNK_SIZE = 1 << 22
+
+
+def read_graph_file(source, weighted: bool, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Read graph from file in chunks, so the whole text is never held in memory.
+    File format is the same as for graph_from_data: number of vertexes in the first line,
+    then one edge per line - ids of vertexes (and weight for weighted graphs) separated by whitespaces.
+    Generator yields number of vertexes first and then chunks of edges:
+    (ids_1, ids_2) or (ids_1, ids_2, weights) as typed arrays.
+    :param source: path to file or file object
+    :param weighted: whether lines contain weights
+    :param chunk_size: approximate number of bytes to read at once
+    :return: generator
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            yield from read_graph_file(file, weighted, chunk_size)
+        return
+
+    yield int(source.readline())
+
+    columns = 3 if weighted else 2
+
+    while True:
+        lines = source.readlines(chunk_size)
+
+        if not lines:
+            break
+
+        tokens = b' '.join(lines).split() if isinstance(lines[0], bytes) else ' '.join(lines).split()
+        del lines
+
+        if len(tokens) % columns:
+            raise ValueError(f'Each edge has to be described by {columns} values.')
+
+        chunk = [array('q', map(int, tokens[0::columns])), array('q', map(int, tokens[1::columns]))]
+
+        if weighted:
+            chunk.append(array('d', map(float, tokens[2::columns])))
+
+        del tokens
+        yield chunk
+
+
+def graph_from_file(source, graph_type, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Streaming version of graph_from_data.
+    :param source: path to file or file object
+    :param graph_type: Undigraph or Digraph object
+    :param chunk_size: approximate number of bytes to read at once
+    :return: Graph object
+    """
+    chunks = read_graph_file(source, weighted=False, chunk_size=chunk_size)
+    g = graph_type(next(chunks))
+
+    for ids_1, ids_2 in chunks:
+        g.add_edges(ids_1, ids_2)
+
+    return g
+
+
+def edge_weight_graph_from_file(source, graph_type, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Streaming version of edge_weight_graph_from_data and edge_weight_digraph_from_data.
+    :param source: path to file or file object
+    :param graph_type: EdgeWeightedGraph or EdgeWeightedDigraph object
+    :param chunk_size: approximate number of bytes to read at once
+    :return: Graph object
+    """
+    chunks = read_graph_file(source, weighted=True, chunk_size=chunk_size)
+    g = graph_type(next(chunks))
+
+    for ids_1, ids_2, weights in chunks:
+        g.add_edges(ids_1, ids_2, weights)
+
+    return g
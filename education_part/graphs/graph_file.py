@@ -0,0 +1,137 @@
+import mmap
+import struct
+import sys
+from array import array
+
+from education_part.graphs import CSRGraph
+
+MAGIC = b'ALGG'
+VERSION = 1
+# magic, version, flags, size of vertex id in bytes, vertexes number, adjacencies number, edges number
+HEADER = struct.Struct('<4sIII3q')
+HEADER_SIZE = 64  # header is padded, so all arrays in file start from 8 bytes aligned position
+
+DIRECTED_FLAG = 1
+WEIGHTED_FLAG = 2
+BIG_ENDIAN_FLAG = 4
+
+
+def _padding(size: int):
+    return b'\0' * (-size % 8)
+
+
+def save_graph(graph, path):
+    """
+    Save graph to versioned binary file.
+    File layout: header, offsets (int64), targets (int32 or int64), weights (float64, weighted graphs only).
+    Arrays are stored in native byte order, so they may be used directly after memory mapping.
+    :param graph: Undigraph, Digraph, EdgeWeightedGraph, EdgeWeightedDigraph or CSRGraph object
+    :param path: path to file
+    :return: None
+    """
+    csr = CSRGraph.from_graph(graph)
+    offsets = array('q', csr.offsets)
+    targets = csr.targets if isinstance(csr.targets, array) else array(csr.targets.format, csr.targets)
+
+    flags = 0
+    if csr.directed:
+        flags |= DIRECTED_FLAG
+    if csr.weighted:
+        flags |= WEIGHTED_FLAG
+    if sys.byteorder == 'big':
+        flags |= BIG_ENDIAN_FLAG
+
+    header = HEADER.pack(
+        MAGIC, VERSION, flags, targets.itemsize, csr.vertexes_number, len(targets), csr.edges_number,
+    )
+
+    with open(path, 'wb') as file:
+        file.write(header.ljust(HEADER_SIZE, b'\0'))
+        offsets.tofile(file)
+        targets.tofile(file)
+        file.write(_padding(targets.itemsize * len(targets)))
+
+        if csr.weighted:
+            weights = csr.weights if isinstance(csr.weights, array) else array('d', csr.weights)
+            weights.tofile(file)
+
+
+def load_graph(path):
+    """
+    Open graph saved by save_graph.
+    File is memory mapped and arrays of returned graph are read only views of the mapped file,
+    so nothing is copied and many processes opening the same file share one copy of it in page cache.
+    :param path: path to file
+    :return: CSRGraph object
+    """
+    with open(path, 'rb') as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, flags, id_size, vertex_num, adjacencies_num, edges_num = HEADER.unpack_from(buffer)
+
+    if magic != MAGIC:
+        raise ValueError(f'File "{path}" is not a graph file.')
+    if version != VERSION:
+        raise ValueError(f'Unsupported graph file version: {version}.')
+    if bool(flags & BIG_ENDIAN_FLAG) != (sys.byteorder == 'big'):
+        raise ValueError('Graph file is saved with another byte order.')
+
+    view = memoryview(buffer)
+    position = HEADER_SIZE
+
+    offsets = view[position:position + 8 * (vertex_num + 1)].cast('q')
+    position += 8 * (vertex_num + 1)
+
+    targets = view[position:position + id_size * adjacencies_num].cast('i' if id_size == 4 else 'q')
+    position += id_size * adjacencies_num
+    position += -position % 8
+
+    weights = None
+    if flags & WEIGHTED_FLAG:
+        weights = view[position:position + 8 * adjacencies_num].cast('d')
+
+    return CSRGraph(
+        vertex_num=vertex_num,
+        offsets=offsets,
+        targets=targets,
+        edges_number=edges_num,
+        directed=bool(flags & DIRECTED_FLAG),
+        weights=weights,
+    )
+
+
+if __name__ == '__main__':
+    import os
+    import tempfile
+    import time
+    from random import randint, random
+
+    from education_part.graphs import edge_weight_digraph_from_data, EdgeWeightedDigraph
+
+    g_data = ['8', '0 1 5.0', '0 4 9.0', '0 7 8.0', '1 2 12.0', '1 3 15.0', '1 7 4.0', '2 3 3.0', '2 6 11.0']
+    g = edge_weight_digraph_from_data(g_data, EdgeWeightedDigraph)
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, 'graph.bin')
+        save_graph(g, file_path)
+        loaded = load_graph(file_path)
+        print(f'Loaded graph: {loaded.vertexes_number} vertexes, {loaded.edges_number} edges')
+        print(f'Adjacencies of vertex 1: {list(loaded.weighted_adjacencies(1))}')
+
+        size = 1_000_000
+        degree = 5
+        big = CSRGraph(
+            vertex_num=size,
+            offsets=array('q', range(0, size * degree + 1, degree)),
+            targets=array('i', (randint(0, size - 1) for _ in range(size * degree))),
+            edges_number=size * degree,
+            weights=array('d', (random() for _ in range(size * degree))),
+        )
+
+        big_path = os.path.join(directory, 'big.bin')
+        save_graph(big, big_path)
+        print(f'File size: {os.path.getsize(big_path)} bytes')
+
+        start = time.time()
+        loaded = load_graph(big_path)
+        print(f'Load of graph with {loaded.edges_number} edges:'.ljust(50), f'{round(time.time() - start, 5)} seconds')
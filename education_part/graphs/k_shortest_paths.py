@@ -0,0 +1,274 @@
+import heapq
+import math
+from array import array
+
+from education_part.data_structures import IndexMinPriorityQueue
+from education_part.graphs import Vertex, EdgeWeightedDigraph, vertex_ids_typecode
+
+
+class KShortestPaths:
+    """
+    Yen's k shortest loopless paths from source to destination, generated lazily one by one.
+    Every next path deviates from one of already found paths: it shares root of found path up to spur vertex
+    and then goes by the shortest spur path which avoids vertexes of the root and edges used by found paths
+    with the same root. All spur paths wait in heap of candidates, the lightest candidate is the next path.
+    Work is shared between spur searches:
+        reverse shortest paths tree to destination is built once; it gives exact spur path whenever tree path
+        from spur vertex is not blocked, and exact heuristic for A* spur search otherwise; A* stops as soon as
+        it reaches vertex with not blocked tree path and takes the rest of spur path from the tree
+        spur vertexes of new path start from vertex where it deviated from its parent path (Lawler),
+        roots before it were already searched
+        costs of roots are prefix sums of found paths
+    Paths are sequences of vertexes, parallel edges are represented by the lightest one.
+    Iteration yields (distance, list of vertexes' ids) pairs in order of distance.
+    """
+    def __init__(self, graph: EdgeWeightedDigraph, source_vertex: Vertex, destination_vertex: Vertex):
+        self.graph = graph
+        self.source_vertex = source_vertex
+        self.destination_vertex = destination_vertex
+        self.found = []
+        self.dijkstra_runs = 0
+        self.spur_searches = 0
+        self.tree_reuses = 0
+
+        self._candidates = []
+        self._candidates_paths = set()
+        self._last = None  # (path, prefix distances, deviation index) of the last found path
+
+        typecode = vertex_ids_typecode(graph.vertexes_number)
+        self.dist_to_destination = array('d', [math.inf]) * graph.vertexes_number
+        self.next_to_destination = array(typecode, [-1]) * graph.vertexes_number
+        self._reverse_tree()
+
+        source_id = source_vertex.id
+        if self.dist_to_destination[source_id] != math.inf:
+            path, prefix = self._tree_path(source_id, 0)
+            self._push_candidate(path, prefix, 0)
+
+    def _reverse_tree(self):
+        """
+        Dijkstra from destination over incoming edges: distances to destination from every vertex
+        """
+        destination_id = self.destination_vertex.id
+        self.dist_to_destination[destination_id] = 0
+        pq = IndexMinPriorityQueue()
+        pq.add_to_queue(destination_id, 0)
+
+        while not pq.is_empty():
+            v_id = pq.pop_min()
+
+            for edge in self.graph.incoming_edges(v_id):
+                u_id = edge.from_vertex().id
+                dist = self.dist_to_destination[v_id] + edge.weight
+
+                if dist < self.dist_to_destination[u_id]:
+                    self.dist_to_destination[u_id] = dist
+                    self.next_to_destination[u_id] = v_id
+
+                    if pq.contains(u_id):
+                        pq.update_priority(u_id, dist)
+                    else:
+                        pq.add_to_queue(u_id, dist)
+
+        self.dijkstra_runs += 1
+
+    def _tree_path(self, v_id: int, v_dist: float):
+        """
+        Path from v_id to destination by reverse tree
+        :return: (list of vertexes' ids, list of distances from path's start, beginning with v_dist)
+        """
+        path = [v_id]
+        prefix = [v_dist]
+        base = v_dist + self.dist_to_destination[v_id]
+
+        while v_id != self.destination_vertex.id:
+            v_id = self.next_to_destination[v_id]
+            path.append(v_id)
+            prefix.append(base - self.dist_to_destination[v_id])
+
+        return path, prefix
+
+    def _push_candidate(self, path: list, prefix: list, deviation: int):
+        key = tuple(path)
+
+        if key in self._candidates_paths:
+            return
+
+        self._candidates_paths.add(key)
+        heapq.heappush(self._candidates, (prefix[-1], len(self._candidates_paths), path, prefix, deviation))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._last is not None:
+            self._spur_paths(*self._last)
+
+        if not self._candidates:
+            raise StopIteration
+
+        dist, _, path, prefix, deviation = heapq.heappop(self._candidates)
+        self._last = (path, prefix, deviation)
+        self.found.append((dist, path))
+        return dist, path
+
+    def shortest_paths(self, k: int):
+        """
+        First k shortest paths, searching only for paths which were not found yet
+        :param k: number of paths
+        :return: list of (distance, list of vertexes' ids) pairs, shorter if there are less than k paths
+        """
+        while len(self.found) < k:
+            if next(self, None) is None:
+                break
+
+        return self.found[:k]
+
+    def _spur_paths(self, path: list, prefix: list, deviation: int):
+        for spur_index in range(deviation, len(path) - 1):
+            spur_id = path[spur_index]
+            root = path[:spur_index + 1]
+            blocked = set(root[:-1])
+            removed = set()
+
+            for _, found_path in self.found:
+                if len(found_path) > spur_index + 1 and found_path[:spur_index + 1] == root:
+                    removed.add(found_path[spur_index + 1])
+
+            self.spur_searches += 1
+            spur = self._spur_path(spur_id, prefix[spur_index], blocked, removed)
+
+            if spur is not None:
+                spur_path, spur_prefix = spur
+                self._push_candidate(root[:-1] + spur_path, prefix[:spur_index] + spur_prefix, spur_index)
+
+    def _spur_path(self, spur_id: int, spur_dist: float, blocked: set, removed: set):
+        """
+        Shortest path from spur vertex to destination avoiding blocked vertexes and edges from spur vertex
+        to removed vertexes
+        :return: (list of vertexes' ids, list of distances from source) or None if there is no such path
+        """
+        if self.dist_to_destination[spur_id] == math.inf:
+            return None
+
+        next_id = self.next_to_destination[spur_id]
+        if next_id not in removed:
+            tree_path, tree_prefix = self._tree_path(spur_id, spur_dist)
+
+            if blocked.isdisjoint(tree_path):
+                self.tree_reuses += 1
+                return tree_path, tree_prefix
+
+        return self._a_star(spur_id, spur_dist, blocked, removed)
+
+    def _a_star(self, spur_id: int, spur_dist: float, blocked: set, removed: set):
+        """
+        A* with exact distances to destination in the whole graph as heuristic.
+        Search stops on the first vertex which tree path to destination avoids blocked vertexes and spur vertex:
+        its priority is the smallest one and is reached by the tree path, so the rest is taken from the tree.
+        """
+        self.dijkstra_runs += 1
+        tree_blocked = blocked | {spur_id}
+        tree_free = {}
+        dist_to = {spur_id: spur_dist}
+        previous = {}
+        pq = IndexMinPriorityQueue()
+        pq.add_to_queue(spur_id, spur_dist + self.dist_to_destination[spur_id])
+
+        while not pq.is_empty():
+            v_id = pq.pop_min()
+
+            if v_id != spur_id and self._tree_path_free(v_id, tree_blocked, tree_free):
+                self.tree_reuses += 1
+                path = [v_id]
+                while path[-1] != spur_id:
+                    path.append(previous[path[-1]])
+                path.reverse()
+
+                tree_path, tree_prefix = self._tree_path(v_id, dist_to[v_id])
+                return path[:-1] + tree_path, [dist_to[w_id] for w_id in path[:-1]] + tree_prefix
+
+            for edge in self.graph.vertexes[v_id].adjacencies:
+                w_id = edge.to_vertex().id
+
+                if w_id in blocked or (v_id == spur_id and w_id in removed):
+                    continue
+                if self.dist_to_destination[w_id] == math.inf:
+                    continue
+
+                dist = dist_to[v_id] + edge.weight
+
+                if dist < dist_to.get(w_id, math.inf):
+                    dist_to[w_id] = dist
+                    previous[w_id] = v_id
+                    priority = dist + self.dist_to_destination[w_id]
+
+                    if pq.contains(w_id):
+                        pq.update_priority(w_id, priority)
+                    else:
+                        pq.add_to_queue(w_id, priority)
+
+        return None
+
+    def _tree_path_free(self, v_id: int, blocked: set, free: dict):
+        """
+        Check that tree path from vertex to destination avoids blocked vertexes, results are memoized in free
+        """
+        chain = []
+
+        while v_id not in free:
+            if v_id in blocked:
+                result = False
+                break
+            if v_id == self.destination_vertex.id:
+                result = True
+                break
+
+            chain.append(v_id)
+            v_id = self.next_to_destination[v_id]
+        else:
+            result = free[v_id]
+
+        for w_id in chain:
+            free[w_id] = result
+
+        return result
+
+
+if __name__ == '__main__':
+    import time
+    from random import randint, random
+
+    from education_part.graphs import edge_weight_digraph_from_data, DijkstraShortestPath
+
+    g_data = [
+        '8', '0 1 5.0', '0 4 9.0', '0 7 8.0', '1 2 12.0', '1 3 15.0', '1 7 4.0', '2 3 3.0', '2 6 11.0',
+        '3 6 9.0', '4 5 4.0', '4 6 20.0', '4 7 5.0', '5 2 1.0', '5 6 13.0', '7 5 6.0', '7 2 7.0',
+    ]
+    g = edge_weight_digraph_from_data(g_data, EdgeWeightedDigraph)
+    print(f'Dijkstra: {DijkstraShortestPath(g, g.vertexes[0]).shortest_path_to(g.vertexes[6])}')
+
+    ksp = KShortestPaths(g, g.vertexes[0], g.vertexes[6])
+    for dist, path in ksp.shortest_paths(5):
+        print(f'{round(dist, 5)}: {path}')
+    print(f'Dijkstra runs: {ksp.dijkstra_runs}, spur searches: {ksp.spur_searches}, tree reuses: {ksp.tree_reuses}')
+
+    print('\n--- Random graph ---')
+    size = 10_000
+    big = EdgeWeightedDigraph(size)
+    big.add_edges(
+        [randint(0, size - 1) for _ in range(size * 4)],
+        [randint(0, size - 1) for _ in range(size * 4)],
+        [random() for _ in range(size * 4)],
+    )
+
+    start = time.time()
+    ksp = KShortestPaths(big, big.vertexes[0], big.vertexes[1])
+    paths = ksp.shortest_paths(5)
+    print(f'First {len(paths)} paths:'.ljust(40), f'{round(time.time() - start, 5)} seconds')
+    print(f'Dijkstra runs: {ksp.dijkstra_runs}, spur searches: {ksp.spur_searches}, tree reuses: {ksp.tree_reuses}')
+
+    start = time.time()
+    paths = ksp.shortest_paths(20)
+    print(f'Next {len(paths) - 5} paths:'.ljust(40), f'{round(time.time() - start, 5)} seconds')
+    print(f'Dijkstra runs: {ksp.dijkstra_runs}, spur searches: {ksp.spur_searches}, tree reuses: {ksp.tree_reuses}')
@@ -0,0 +1,90 @@
+import sys
+
+
+def object_size(obj):
+    """
+    Size of object itself with its attributes dictionary if there is one (objects without __slots__)
+    :param obj: any object
+    :return: int: bytes
+    """
+    size = sys.getsizeof(obj)
+
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+
+    return size
+
+
+def graph_memory_usage(graph):
+    """
+    Bytes taken by structure of the graph: vertex objects with their adjacency lists and edge objects with weights.
+    Ints in adjacency lists are not counted - small ones are shared by interpreter and ids are the same for any
+    graph representation. CSRGraph reports its arrays.
+    :param graph: any graph object
+    :return: dict with "vertexes" and "edges" bytes and bytes "per_vertex" and "per_edge"
+    """
+    if hasattr(graph, 'memory_usage'):
+        vertexes_size = 0
+        edges_size = graph.memory_usage()
+    else:
+        vertexes_size = sys.getsizeof(graph.vertexes)
+        edges_size = 0
+
+        for vertex in graph.vertexes:
+            vertexes_size += object_size(vertex)
+            edges_size += sys.getsizeof(vertex.adjacencies)
+
+        for edge in getattr(graph, 'edges', ()):
+            edges_size += object_size(edge) + sys.getsizeof(edge.weight)
+
+        if hasattr(graph, 'edges'):
+            edges_size += sys.getsizeof(graph.edges)
+
+    return {
+        'vertexes': vertexes_size,
+        'edges': edges_size,
+        'per_vertex': round(vertexes_size / graph.vertexes_number, 2) if graph.vertexes_number else 0,
+        'per_edge': round(edges_size / graph.edges_number, 2) if graph.edges_number else 0,
+    }
+
+
+def edges_memory_usage(edges: list):
+    """
+    Bytes taken by list of edge objects with their weights, not counting vertexes edges refer to
+    :param edges: list of Edge, Diedge, CompactEdge or CompactDiedge objects
+    :return: int: bytes
+    """
+    return sys.getsizeof(edges) + sum(object_size(edge) + sys.getsizeof(edge.weight) for edge in edges)
+
+
+if __name__ == '__main__':
+    from random import randint, random
+
+    from education_part.graphs import Digraph, EdgeWeightedDigraph, CSRGraph
+
+    size = 20_000
+    edges_num = size * 5
+    ids_1 = [randint(0, size - 1) for _ in range(edges_num)]
+    ids_2 = [randint(0, size - 1) for _ in range(edges_num)]
+    weights = [random() for _ in range(edges_num)]
+
+    digraph = Digraph(size)
+    digraph.add_edges(ids_1, ids_2)
+    weighted = EdgeWeightedDigraph(size)
+    weighted.add_edges(ids_1, ids_2, weights)
+
+    print('Graph'.ljust(30), 'bytes per vertex'.rjust(20), 'bytes per edge'.rjust(20))
+    for graph in (digraph, CSRGraph.from_graph(digraph), weighted, CSRGraph.from_graph(weighted)):
+        usage = graph_memory_usage(graph)
+        name = f'{graph.__class__.__name__}{" (weighted)" if graph.weighted else ""}'
+        print(name.ljust(30), str(usage['per_vertex']).rjust(20), str(usage['per_edge']).rjust(20))
+
+    vertex = weighted.vertexes[0]
+    edge = weighted.edges[0]
+    compact_edge = edge.compact()
+    print(f'\nVertex object: {object_size(vertex)} bytes + adjacencies list')
+    print(f'Diedge object: {object_size(edge)} bytes, CompactDiedge object: {object_size(compact_edge)} bytes')
+
+    compact_edges = [edge.compact() for edge in weighted.edges]
+    print(f'Bytes per edge in list of Diedge: {round(edges_memory_usage(weighted.edges) / edges_num, 2)}')
+    print(f'Bytes per edge in list of CompactDiedge: {round(edges_memory_usage(compact_edges) / edges_num, 2)}')
@@ -0,0 +1,114 @@
+from array import array
+
+from education_part.graphs import Graph, vertex_ids_typecode
+
+
+class MultiSourceBreadthFirstSearch:
+    """
+    Breadth first search from many sources in one walk over the graph (MS-BFS).
+    For every vertex two bitsets are kept (python int is used as bitset of any width):
+        seen - bit "i" is set if vertex is already reached from source number "i"
+        visit - bit "i" is set if vertex is on the current level of search from source number "i"
+    Adjacencies of vertex are scanned once per level for all sources which reached this vertex on that level.
+    Result is dist_to_root: one row of distances per source, -1 for unreachable vertexes.
+    """
+    def __init__(self, graph: Graph, sources: list):
+        self.graph = graph
+        self.sources = list(sources)
+        self.dist_to_root = [
+            array(vertex_ids_typecode(graph.vertexes_number), [-1]) * graph.vertexes_number
+            for _ in self.sources
+        ]
+        self.seen = [0 for _ in range(graph.vertexes_number)]
+
+        self.__breadth_first_paths()
+
+    def __breadth_first_paths(self):
+        seen = self.seen
+        dist_to_root = self.dist_to_root
+        adjacencies = self.graph.adjacencies
+        visit = {}
+
+        for source_index, source_id in enumerate(self.sources):
+            seen[source_id] |= 1 << source_index
+            visit[source_id] = visit.get(source_id, 0) | (1 << source_index)
+            dist_to_root[source_index][source_id] = 0
+
+        distance = 0
+
+        while visit:
+            distance += 1
+            visit_next = {}
+
+            for vertex_id, vertex_bits in visit.items():
+                for adj in adjacencies(vertex_id):
+                    new_bits = vertex_bits & ~seen[adj]
+
+                    if not new_bits:
+                        continue
+
+                    seen[adj] |= new_bits
+                    visit_next[adj] = visit_next.get(adj, 0) | new_bits
+
+                    while new_bits:
+                        lowest_bit = new_bits & -new_bits
+                        dist_to_root[lowest_bit.bit_length() - 1][adj] = distance
+                        new_bits ^= lowest_bit
+
+            visit = visit_next
+
+    def has_path_to(self, source_index: int, vertex_id: int):
+        return bool(self.seen[vertex_id] >> source_index & 1)
+
+    def dist_to(self, source_index: int, vertex_id: int):
+        """
+        Number of edges on the shortest path from source to vertex
+        :param source_index: index of source in the list of sources
+        :param vertex_id: id of vertex
+        :return: int: distance, -1 if vertex is unreachable
+        """
+        return self.dist_to_root[source_index][vertex_id]
+
+    def eccentricity(self, source_index: int):
+        """
+        Max distance from source to any reachable vertex
+        :param source_index: index of source in the list of sources
+        :return: int
+        """
+        return max(self.dist_to_root[source_index])
+
+
+if __name__ == '__main__':
+    import time
+    from random import randint
+
+    from education_part.graphs import graph_from_data, Undigraph, BreadthFirstSearch, CSRGraph
+
+    g = graph_from_data(
+        data=['13', '0 5', '4 3', '0 1', '9 12', '6 4', '5 4', '0 2', '11 12', '9 10', '0 6', '7 8', '9 11', '3 5'],
+        graph_type=Undigraph,
+    )
+    ms_bfs = MultiSourceBreadthFirstSearch(g, [0, 3, 9])
+    for index, source in enumerate(ms_bfs.sources):
+        print(f'Distances from {source}: {list(ms_bfs.dist_to_root[index])}')
+        print(f'Eccentricity of {source}: {ms_bfs.eccentricity(index)}')
+
+    print('\n--- All roots reachability ---')
+    size = 5_000
+    big = Undigraph(size)
+    for _ in range(size * 3):
+        big.add_edge(randint(0, size - 1), randint(0, size - 1))
+    big = CSRGraph.from_graph(big)
+    roots = list(range(256))
+
+    start = time.time()
+    single_rows = [BreadthFirstSearch(big, root).dist_to_root for root in roots]
+    print(f'BreadthFirstSearch from {len(roots)} roots:'.ljust(50), f'{round(time.time() - start, 5)} seconds')
+
+    start = time.time()
+    ms_bfs = MultiSourceBreadthFirstSearch(big, roots)
+    print(f'MultiSourceBreadthFirstSearch from {len(roots)} roots:'.ljust(50), end='')
+    print(f' {round(time.time() - start, 5)} seconds')
+
+    if single_rows != ms_bfs.dist_to_root:
+        print('Distances are different!!!')
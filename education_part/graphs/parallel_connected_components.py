@@ -0,0 +1,139 @@
+from array import array
+from bisect import bisect_left
+from multiprocessing import Pool
+
+from education_part.connectivity import QuickUnionRanked
+from education_part.graphs import CSRGraph, SharedGraph, attach_graph, vertex_ids_typecode
+
+# Graph attached by worker process of ParallelConnectedComponents pool
+_worker_graph = None
+
+
+def _attach_worker(descriptor: dict):
+    global _worker_graph
+    _worker_graph = attach_graph(descriptor)
+
+
+def _shard_roots(graph: CSRGraph, start: int, end: int):
+    """
+    Union-find over edges of vertexes with ids from start to end.
+    Every edge of undirected graph is in adjacencies of both its vertexes, so it is united from smaller id only.
+    :return: flat array of (vertex id, root id) pairs for every vertex which is not root of its own set
+    """
+    quick_union = QuickUnionRanked(graph.vertexes_number)
+
+    for v_id in range(start, end):
+        for adj in graph.adjacencies(v_id):
+            if v_id < adj:
+                quick_union.union(v_id, adj)
+
+    pairs = array(vertex_ids_typecode(graph.vertexes_number))
+    for v_id, parent_id in enumerate(quick_union.data):
+        if parent_id != v_id:
+            pairs.append(v_id)
+            pairs.append(quick_union.get_root(v_id))
+
+    return pairs
+
+
+def _worker_shard_roots(task):
+    _, graph = _worker_graph
+    return _shard_roots(graph, *task)
+
+
+class ParallelConnectedComponents:
+    """
+    Connected components by union-find instead of depth first search.
+    Graph is frozen into CSRGraph and split into shards of vertexes with about the same number of adjacencies.
+    Every shard is united in worker process of the pool, workers attach to one copy of the graph in shared memory
+    and return only vertexes which got another root, these pairs are united once more in global union-find.
+    Components are numbered in order of their first vertex, so component_id is the same as in ConnectedComponents.
+    """
+    def __init__(self, graph, processes: int = None, shards: int = None):
+        if graph.directed:
+            raise ValueError('ParallelConnectedComponents works with undirected graphs only.')
+
+        self.graph = graph
+        self.quick_union = QuickUnionRanked(graph.vertexes_number)
+        csr = CSRGraph.from_graph(graph)
+
+        if processes is None:
+            self._merge(_shard_roots(csr, 0, csr.vertexes_number))
+        else:
+            with SharedGraph(csr) as shared:
+                with Pool(processes, initializer=_attach_worker, initargs=(shared.descriptor,)) as pool:
+                    for pairs in pool.imap_unordered(_worker_shard_roots, self._shards(csr, shards or processes)):
+                        self._merge(pairs)
+
+        typecode = vertex_ids_typecode(graph.vertexes_number)
+        self.component_id = array(typecode, [-1]) * graph.vertexes_number
+        self.components_count = 0
+        root_component = array(typecode, [-1]) * graph.vertexes_number
+
+        for v_id in range(graph.vertexes_number):
+            root_id = self.quick_union.get_root(v_id)
+
+            if root_component[root_id] == -1:
+                root_component[root_id] = self.components_count
+                self.components_count += 1
+
+            self.component_id[v_id] = root_component[root_id]
+
+    @staticmethod
+    def _shards(csr: CSRGraph, shards: int):
+        """
+        :return: list of (start, end) ranges of vertexes' ids, shards are split by offsets of adjacencies
+        """
+        adjacencies_num = csr.offsets[csr.vertexes_number]
+        bounds = [0]
+
+        for shard in range(1, shards):
+            bound = min(bisect_left(csr.offsets, adjacencies_num * shard // shards), csr.vertexes_number)
+            if bound > bounds[-1]:
+                bounds.append(bound)
+
+        bounds.append(csr.vertexes_number)
+        return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+    def _merge(self, pairs):
+        for position in range(0, len(pairs), 2):
+            self.quick_union.union(pairs[position], pairs[position + 1])
+
+    def components_number(self):
+        return self.components_count
+
+    def component_if_for_vertex_id(self, vertex_id: int):
+        return self.component_id[vertex_id]
+
+
+if __name__ == '__main__':
+    import os
+    import time
+    from random import randint
+
+    from education_part.graphs import Undigraph, Digraph, ConnectedComponents
+
+    size = 200_000
+    random_graph = Undigraph(size)
+    random_graph.add_edges([randint(0, size - 1) for _ in range(size)], [randint(0, size - 1) for _ in range(size)])
+
+    start = time.time()
+    cc = ConnectedComponents(random_graph)
+    print(f'ConnectedComponents, {cc.components_number()} components:'.ljust(60), end='')
+    print(f' {round(time.time() - start, 5)} seconds')
+
+    for processes in (None, 2, 4):
+        start = time.time()
+        parallel_cc = ParallelConnectedComponents(random_graph, processes=processes)
+        print(f'ParallelConnectedComponents, {processes} processes:'.ljust(60), end='')
+        print(f' {round(time.time() - start, 5)} seconds')
+
+        if list(parallel_cc.component_id) != cc.component_id:
+            print('Components are different!!!')
+
+    print(f'CPUs: {os.cpu_count()}')
+
+    try:
+        ParallelConnectedComponents(Digraph(2))
+    except ValueError as error:
+        print(f'Digraph: {error}')
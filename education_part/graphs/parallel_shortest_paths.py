@@ -0,0 +1,114 @@
+from multiprocessing import Pool
+
+from education_part.graphs import SharedGraph, attach_graph, dijkstra_distances
+
+# Graph attached by worker process of the pool
+_worker_graph = None
+
+
+def _attach_worker(descriptor: dict):
+    global _worker_graph
+    _worker_graph = attach_graph(descriptor)
+
+
+def _worker_distances(source_id: int):
+    _, graph = _worker_graph
+    return source_id, dijkstra_distances(graph, source_id)
+
+
+class ManySourceShortestPaths:
+    """
+    Iterator of shortest path distances from many sources computed in pool of processes.
+    Graph is copied once to shared memory and every worker attaches to it,
+    so neither Vertex nor Diedge objects are pickled. Results are streamed back as soon as they are ready.
+    Pool and shared memory are released when iteration ends or fails. Caller who may stop earlier
+    has to call close (or use object as context manager).
+    """
+    def __init__(self, graph, sources: list, processes: int = None, chunk_size: int = 1):
+        self._results = None
+        self.shared = SharedGraph(graph)
+
+        try:
+            self.pool = Pool(processes, initializer=_attach_worker, initargs=(self.shared.descriptor,))
+        except BaseException:
+            self.shared.close()
+            raise
+
+        self._results = self.pool.imap(_worker_distances, sources, chunk_size)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._results is None:
+            raise StopIteration
+
+        try:
+            return next(self._results)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        if self._results is None:
+            return
+
+        self._results = None
+        try:
+            self.pool.terminate()
+            self.pool.join()
+        finally:
+            self.shared.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+
+def many_source_shortest_paths(graph, sources: list, processes: int = None, chunk_size: int = 1):
+    """
+    Shortest path distances from many sources computed in pool of processes
+    :param graph: EdgeWeightedDigraph or weighted CSRGraph object
+    :param sources: ids of source vertexes
+    :param processes: number of worker processes, number of CPUs by default
+    :param chunk_size: number of sources sent to worker at once
+    :return: ManySourceShortestPaths iterator of (source_id, array of distances) pairs in order of sources
+    """
+    return ManySourceShortestPaths(graph, sources, processes, chunk_size)
+
+
+if __name__ == '__main__':
+    import os
+    import time
+    from array import array
+    from random import randint, random
+
+    from education_part.graphs import CSRGraph
+
+    size = 5_000
+    degree = 5
+    g = CSRGraph(
+        vertex_num=size,
+        offsets=array('q', range(0, size * degree + 1, degree)),
+        targets=array('i', (randint(0, size - 1) for _ in range(size * degree))),
+        edges_number=size * degree,
+        weights=array('d', (random() for _ in range(size * degree))),
+    )
+    sources = list(range(64))
+
+    start = time.time()
+    serial = [dijkstra_distances(g, source_id) for source_id in sources]
+    print(f'Serial Dijkstra from {len(sources)} sources:'.ljust(50), f'{round(time.time() - start, 5)} seconds')
+
+    start = time.time()
+    with many_source_shortest_paths(g, sources) as results:
+        parallel = [dist_to for _, dist_to in results]
+    print(f'Pool of {os.cpu_count()} processes:'.ljust(50), f'{round(time.time() - start, 5)} seconds')
+
+    if serial != parallel:
+        print('Distances are different!!!')
@@ -0,0 +1,247 @@
+import math
+
+from education_part.data_structures import IndexMinPriorityQueue
+from education_part.graphs import Vertex, EdgeWeightedDigraph, ShortestPath
+
+
+class PointToPointShortestPath(ShortestPath):
+    """
+    Shortest path between two given vertexes.
+    Search stops as soon as path to destination is proved to be the shortest one,
+    so only part of the graph is settled. dist_to and edge_to are dicts with entries only for reached vertexes.
+    """
+    destination_vertex: Vertex
+    settled_number: int
+
+    def shortest_path_to(self, destination_vertex: Vertex = None):
+        """
+        :param destination_vertex: destination of the query (the only vertex path is guaranteed to be found to)
+        :return: distance and list of vertexes' ids on the path, (math.inf, None) if destination is unreachable
+        """
+        if destination_vertex is None:
+            destination_vertex = self.destination_vertex
+
+        if destination_vertex.id not in self.edge_to and destination_vertex is not self.source_vertex:
+            return math.inf, None
+
+        return super().shortest_path_to(destination_vertex)
+
+    def _parent_id(self, v_id: int):
+        edge = self.edge_to.get(v_id)
+
+        if edge is None:
+            return None
+
+        return edge.from_vertex().id
+
+    def _distance(self, v_id: int):
+        return self.dist_to.get(v_id, math.inf)
+
+    def _vertexes_number(self):
+        return self.graph.vertexes_number
+
+
+class BidirectionalDijkstraShortestPath(PointToPointShortestPath):
+    """
+    Dijkstra searches from source over the graph and from destination over the reverse view of the graph.
+    Search stops when sum of the smallest distances in both queues is not less than the best path found.
+    """
+    def __init__(self, graph: EdgeWeightedDigraph, source_vertex: Vertex, destination_vertex: Vertex):
+        self.graph = graph
+        self.source_vertex = source_vertex
+        self.destination_vertex = destination_vertex
+        self.dist_to = {source_vertex.id: 0}
+        self.edge_to = {}
+        self.dist_from = {destination_vertex.id: 0}
+        self.edge_from = {}
+        self.settled_number = 0
+
+        self.best_dist = math.inf
+        self.meeting_id = None
+
+        if source_vertex is destination_vertex:
+            self.best_dist = 0
+            return
+
+        self.forward_pq = IndexMinPriorityQueue()
+        self.forward_pq.add_to_queue(source_vertex.id, 0)
+        self.backward_pq = IndexMinPriorityQueue()
+        self.backward_pq.add_to_queue(destination_vertex.id, 0)
+
+        while not self.forward_pq.is_empty() and not self.backward_pq.is_empty():
+            forward_top = self.forward_pq.get_top_priority()
+            backward_top = self.backward_pq.get_top_priority()
+
+            if forward_top + backward_top >= self.best_dist:
+                break
+
+            if forward_top <= backward_top:
+                vertex_id = self.forward_pq.pop_min()
+                for edge in self.graph.vertexes[vertex_id].adjacencies:
+                    self._relax_forward(edge)
+            else:
+                vertex_id = self.backward_pq.pop_min()
+                for edge in self.graph.incoming_edges(vertex_id):
+                    self._relax_backward(edge)
+
+            self.settled_number += 1
+
+        self._join_paths()
+
+    def _relax_forward(self, edge):
+        v1 = edge.from_vertex().id
+        v2 = edge.to_vertex().id
+        dist = self.dist_to[v1] + edge.weight
+
+        if dist < self.dist_to.get(v2, math.inf):
+            self.dist_to[v2] = dist
+            self.edge_to[v2] = edge
+
+            if self.forward_pq.contains(v2):
+                self.forward_pq.update_priority(v2, dist)
+            else:
+                self.forward_pq.add_to_queue(v2, dist)
+
+            if v2 in self.dist_from and dist + self.dist_from[v2] < self.best_dist:
+                self.best_dist = dist + self.dist_from[v2]
+                self.meeting_id = v2
+
+    def _relax_backward(self, edge):
+        v1 = edge.from_vertex().id
+        v2 = edge.to_vertex().id
+        dist = self.dist_from[v2] + edge.weight
+
+        if dist < self.dist_from.get(v1, math.inf):
+            self.dist_from[v1] = dist
+            self.edge_from[v1] = edge
+
+            if self.backward_pq.contains(v1):
+                self.backward_pq.update_priority(v1, dist)
+            else:
+                self.backward_pq.add_to_queue(v1, dist)
+
+            if v1 in self.dist_to and dist + self.dist_to[v1] < self.best_dist:
+                self.best_dist = dist + self.dist_to[v1]
+                self.meeting_id = v1
+
+    def _join_paths(self):
+        """
+        Continue path tree of forward search with backward search edges from meeting vertex to destination.
+        """
+        if self.meeting_id is None:
+            return
+
+        vertex_id = self.meeting_id
+
+        while vertex_id != self.destination_vertex.id:
+            edge = self.edge_from[vertex_id]
+            vertex_id = edge.to_vertex().id
+            self.edge_to[vertex_id] = edge
+            self.dist_to[vertex_id] = self.dist_to[edge.from_vertex().id] + edge.weight
+
+        self.dist_to[vertex_id] = self.best_dist
+
+
+class AStarShortestPath(PointToPointShortestPath):
+    """
+    Dijkstra search directed to destination by heuristic: priority of vertex is dist_to[vertex] + heuristic.
+    Heuristic is a function of (vertex_id, destination_id) and has to be admissible -
+    never bigger than real distance from vertex to destination. Without heuristic it is plain Dijkstra
+    which stops when destination is reached.
+    """
+    def __init__(
+            self,
+            graph: EdgeWeightedDigraph,
+            source_vertex: Vertex,
+            destination_vertex: Vertex,
+            heuristic=None,
+    ):
+        self.graph = graph
+        self.source_vertex = source_vertex
+        self.destination_vertex = destination_vertex
+        self.heuristic = heuristic if heuristic is not None else lambda v_id, destination_id: 0
+        self.dist_to = {source_vertex.id: 0}
+        self.edge_to = {}
+        self.settled_number = 0
+        self.pq = IndexMinPriorityQueue()
+
+        self.pq.add_to_queue(source_vertex.id, self.heuristic(source_vertex.id, destination_vertex.id))
+
+        while not self.pq.is_empty():
+            vertex_id = self.pq.pop_min()
+            self.settled_number += 1
+
+            if vertex_id == destination_vertex.id:
+                break
+
+            for edge in self.graph.vertexes[vertex_id].adjacencies:
+                self._relax(edge)
+
+    def _relax(self, edge):
+        v1 = edge.from_vertex().id
+        v2 = edge.to_vertex().id
+        dist = self.dist_to[v1] + edge.weight
+
+        if dist < self.dist_to.get(v2, math.inf):
+            self.dist_to[v2] = dist
+            self.edge_to[v2] = edge
+            priority = dist + self.heuristic(v2, self.destination_vertex.id)
+
+            if self.pq.contains(v2):
+                self.pq.update_priority(v2, priority)
+            else:
+                self.pq.add_to_queue(v2, priority)
+
+
+if __name__ == '__main__':
+    import time
+    from random import randint
+
+    from education_part.graphs import edge_weight_digraph_from_data, DijkstraShortestPath, Diedge
+
+    g_data = [
+        '8', '0 1 5.0', '0 4 9.0', '0 7 8.0', '1 2 12.0', '1 3 15.0', '1 7 4.0', '2 3 3.0', '2 6 11.0',
+        '3 6 9.0', '4 5 4.0', '4 6 20.0', '4 7 5.0', '5 2 1.0', '5 6 13.0', '7 5 6.0', '7 2 7.0',
+    ]
+    g = edge_weight_digraph_from_data(g_data, EdgeWeightedDigraph)
+    sp_from = g.vertexes[0]
+    sp_to = g.vertexes[6]
+
+    print(f'Dijkstra: {DijkstraShortestPath(g, sp_from).shortest_path_to(sp_to)}')
+    print(f'Bidirectional Dijkstra: {BidirectionalDijkstraShortestPath(g, sp_from, sp_to).shortest_path_to()}')
+    print(f'A*: {AStarShortestPath(g, sp_from, sp_to).shortest_path_to()}')
+
+    print('\n--- Queries on grid ---')
+    side = 60
+    grid = EdgeWeightedDigraph(side * side)
+    for row in range(side):
+        for col in range(side):
+            v_id = row * side + col
+            neighbours = []
+            if col + 1 < side:
+                neighbours.append(v_id + 1)
+            if row + 1 < side:
+                neighbours.append(v_id + side)
+            for n_id in neighbours:
+                weight = randint(1, 10)
+                grid.add_edge(Diedge(grid.vertexes[v_id], grid.vertexes[n_id], weight))
+                grid.add_edge(Diedge(grid.vertexes[n_id], grid.vertexes[v_id], weight))
+
+    def manhattan(v_id, destination_id):
+        return abs(v_id // side - destination_id // side) + abs(v_id % side - destination_id % side)
+
+    sp_from = grid.vertexes[side * (side // 2) + side // 4]
+    sp_to = grid.vertexes[side * (side // 2) + side * 3 // 4]
+
+    start = time.time()
+    print(f'Dijkstra: {DijkstraShortestPath(grid, sp_from).shortest_path_to(sp_to)[0]}'.ljust(40), end='')
+    print(f'settled {grid.vertexes_number}'.ljust(15), f'{round(time.time() - start, 5)} seconds')
+
+    for name, search in (
+            ('Bidirectional', lambda: BidirectionalDijkstraShortestPath(grid, sp_from, sp_to)),
+            ('A*', lambda: AStarShortestPath(grid, sp_from, sp_to, manhattan)),
+    ):
+        start = time.time()
+        result = search()
+        print(f'{name}: {result.shortest_path_to()[0]}'.ljust(40), end='')
+        print(f'settled {result.settled_number}'.ljust(15), f'{round(time.time() - start, 5)} seconds')
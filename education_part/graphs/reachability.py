@@ -0,0 +1,172 @@
+import struct
+import sys
+from array import array
+
+from education_part.graphs import StronglyConnectedComponents, write_array, read_array
+
+MAGIC = b'ALRI'
+VERSION = 2
+HEADER = struct.Struct('<4sIIqq')  # magic, version, flags, vertexes number, components number
+
+BIG_ENDIAN_FLAG = 1
+
+
+class ReachabilityIndex:
+    """
+    Precomputed answers to "can vertex v reach vertex w" questions for static directed graph.
+    Graph is condensed to DAG of strongly connected components, and every component gets bitset label
+    of components reachable from it. Tarjan's algorithm numbers components in reverse topological order,
+    so labels are built in one pass: label of component is its own bit united with labels of its successors,
+    which always have smaller ids and are ready.
+    Labels are stored as rows of bytes, so query is one lookup in component_id and one byte test.
+    Memory is components_number ** 2 / 8 bytes, so index fits graphs with up to ~100 000 components.
+    """
+    def __init__(self, graph=None):
+        self.vertexes_number = 0
+        self.components_count = 0
+        self.component_id = array('i')
+        self.row_size = 0
+        self.labels = bytearray()
+
+        if graph is None:
+            return
+
+        scc = StronglyConnectedComponents(graph)
+        self.vertexes_number = graph.vertexes_number
+        self.components_count = scc.components_count
+        self.component_id = scc.component_id
+        self.row_size = (self.components_count + 7) // 8
+
+        condensation = scc.condensation()
+        row_size = self.row_size
+        self.labels = bytearray(row_size * self.components_count)
+
+        # only label of current component is kept as int, others are already written to rows
+        for c_id in range(self.components_count):
+            label = 1 << c_id
+            for successor_id in condensation.adjacencies(c_id):
+                position = successor_id * row_size
+                label |= int.from_bytes(self.labels[position:position + row_size], 'little')
+
+            position = c_id * row_size
+            self.labels[position:position + row_size] = label.to_bytes(row_size, 'little')
+
+    def can_reach(self, v_id: int, w_id: int):
+        """
+        :param v_id: id of vertex path starts from
+        :param w_id: id of vertex path goes to
+        :return: True if there is directed path from v_id to w_id
+        """
+        v_component = self.component_id[v_id]
+        w_component = self.component_id[w_id]
+
+        if w_component > v_component:
+            return False
+
+        return bool(self.labels[v_component * self.row_size + (w_component >> 3)] >> (w_component & 7) & 1)
+
+    def reachable_number(self, v_id: int):
+        """
+        :param v_id: id of vertex
+        :return: number of components reachable from vertex, including its own
+        """
+        position = self.component_id[v_id] * self.row_size
+        return int.from_bytes(self.labels[position:position + self.row_size], 'little').bit_count()
+
+    def memory_usage(self):
+        """
+        :return: bytes taken by component ids and labels
+        """
+        return self.component_id.itemsize * len(self.component_id) + len(self.labels)
+
+    def save(self, path):
+        """
+        Save index to binary file. Component ids are stored with their typecode, item size and byte order,
+        so file saved on another platform is converted on load.
+        :param path: path to file
+        :return: None
+        """
+        flags = BIG_ENDIAN_FLAG if sys.byteorder == 'big' else 0
+
+        with open(path, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, flags, self.vertexes_number, self.components_count))
+            write_array(file, self.component_id)
+            file.write(self.labels)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load index saved by save method
+        :param path: path to file
+        :return: ReachabilityIndex object
+        """
+        index = cls()
+
+        with open(path, 'rb') as file:
+            magic, version, flags, vertex_num, components_num = HEADER.unpack(file.read(HEADER.size))
+
+            if magic != MAGIC:
+                raise ValueError(f'File "{path}" is not a reachability index file.')
+            if version != VERSION:
+                raise ValueError(f'Unsupported reachability index file version: {version}.')
+
+            swap = bool(flags & BIG_ENDIAN_FLAG) != (sys.byteorder == 'big')
+            index.vertexes_number = vertex_num
+            index.components_count = components_num
+            index.row_size = (components_num + 7) // 8
+            index.component_id = read_array(file, vertex_num, swap)
+            index.labels = bytearray(file.read(index.row_size * components_num))
+
+        return index
+
+
+if __name__ == '__main__':
+    import os
+    import tempfile
+    import time
+    from random import randint
+
+    from education_part.graphs import graph_from_data, Digraph, DepthFirstSearch
+
+    g = graph_from_data(
+        data=[
+            13, '4 2', '2 3', '3 2', '6 0', '0 1', '2 0', '11 12', '12 9', '9 10', '9 11', '7 9', '10 12', '11 4',
+            '4 3', '3 5', '6 8', '8 6', '5 4', '0 5', '6 4', '6 9', '7 6',
+        ],
+        graph_type=Digraph,
+    )
+    index = ReachabilityIndex(g)
+    print(f'0 can reach 3: {index.can_reach(0, 3)}')
+    print(f'3 can reach 6: {index.can_reach(3, 6)}')
+    print(f'7 can reach 1: {index.can_reach(7, 1)}')
+    print(f'Components reachable from 9: {index.reachable_number(9)}')
+
+    print('\n--- Random graph ---')
+    size = 5_000
+    big = Digraph(size)
+    big.add_edges([randint(0, size - 1) for _ in range(size)], [randint(0, size - 1) for _ in range(size)])
+    queries = [(randint(0, size - 1), randint(0, size - 1)) for _ in range(1_000)]
+
+    start = time.time()
+    index = ReachabilityIndex(big)
+    print(f'Index of {index.components_count} components:'.ljust(50), f'{round(time.time() - start, 5)} seconds')
+    print(f'Memory usage: {index.memory_usage()} bytes')
+
+    start = time.time()
+    dfs_answers = [DepthFirstSearch(big, v_id).has_path_to(w_id) for v_id, w_id in queries]
+    print(f'{len(queries)} queries by DepthFirstSearch:'.ljust(50), f'{round(time.time() - start, 5)} seconds')
+
+    start = time.time()
+    index_answers = [index.can_reach(v_id, w_id) for v_id, w_id in queries]
+    print(f'{len(queries)} queries by ReachabilityIndex:'.ljust(50), f'{round(time.time() - start, 5)} seconds')
+
+    if dfs_answers != index_answers:
+        print('Answers are different!!!')
+
+    with tempfile.TemporaryDirectory() as directory:
+        index_path = os.path.join(directory, 'reachability.bin')
+        index.save(index_path)
+        loaded = ReachabilityIndex.load(index_path)
+
+        if [loaded.can_reach(v_id, w_id) for v_id, w_id in queries] != index_answers:
+            print('Answers of loaded index are different!!!')
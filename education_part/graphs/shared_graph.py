@@ -0,0 +1,84 @@
+from array import array
+from multiprocessing import shared_memory
+
+from education_part.graphs import CSRGraph
+
+
+class SharedGraph:
+    """
+    Copy of CSRGraph in one shared memory block: offsets (int64), targets (int32 or int64), weights (float64).
+    Other processes attach to the block by descriptor and read the graph without copying or pickling it.
+    Owner of SharedGraph has to close it (or use it as context manager) to free the block.
+    """
+    def __init__(self, graph):
+        csr = CSRGraph.from_graph(graph)
+        targets_typecode = 'i' if csr.targets.itemsize == 4 else 'q'
+        parts = [array('q', csr.offsets), array(targets_typecode, csr.targets)]
+
+        if csr.weighted:
+            parts.append(array('d', csr.weights))
+
+        sizes = [part.itemsize * len(part) for part in parts]
+        aligned_sizes = [size + (-size % 8) for size in sizes]
+        self.shared_memory = shared_memory.SharedMemory(create=True, size=max(sum(aligned_sizes), 1))
+
+        position = 0
+        for part, size, aligned_size in zip(parts, sizes, aligned_sizes):
+            self.shared_memory.buf[position:position + size] = part.tobytes()
+            position += aligned_size
+
+        self.descriptor = {
+            'name': self.shared_memory.name,
+            'vertex_num': csr.vertexes_number,
+            'adjacencies_num': len(parts[1]),
+            'targets_typecode': targets_typecode,
+            'edges_number': csr.edges_number,
+            'directed': csr.directed,
+            'weighted': csr.weighted,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.shared_memory.close()
+        self.shared_memory.unlink()
+
+
+def attach_graph(descriptor: dict):
+    """
+    Attach to graph shared by SharedGraph.
+    Shared memory object has to be kept while graph is used, arrays of the graph are views of its buffer.
+    :param descriptor: SharedGraph.descriptor
+    :return: (SharedMemory object, read only CSRGraph object)
+    """
+    block = shared_memory.SharedMemory(name=descriptor['name'])
+    view = block.buf.toreadonly()
+    vertex_num = descriptor['vertex_num']
+    adjacencies_num = descriptor['adjacencies_num']
+    targets_itemsize = 4 if descriptor['targets_typecode'] == 'i' else 8
+
+    position = 0
+    offsets = view[position:position + 8 * (vertex_num + 1)].cast('q')
+    position += 8 * (vertex_num + 1)
+
+    targets = view[position:position + targets_itemsize * adjacencies_num].cast(descriptor['targets_typecode'])
+    position += targets_itemsize * adjacencies_num
+    position += -position % 8
+
+    weights = None
+    if descriptor['weighted']:
+        weights = view[position:position + 8 * adjacencies_num].cast('d')
+
+    graph = CSRGraph(
+        vertex_num=vertex_num,
+        offsets=offsets,
+        targets=targets,
+        edges_number=descriptor['edges_number'],
+        directed=descriptor['directed'],
+        weights=weights,
+    )
+    return block, graph
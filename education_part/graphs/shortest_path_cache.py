@@ -0,0 +1,146 @@
+from array import array
+from collections import OrderedDict
+
+from education_part.graphs import Vertex, EdgeWeightedDigraph, ShortestPath, DijkstraShortestPath, vertex_ids_typecode
+
+
+class CachedShortestPath(ShortestPath):
+    """
+    Compact copy of shortest path tree:
+        dist_to - array of distances from source, math.inf for unreachable vertexes
+        edge_to - array of ids of previous vertexes on the paths, -1 for source and unreachable vertexes
+    """
+    def __init__(self, source_vertex: Vertex, dist_to: array, edge_to: array):
+        self.source_vertex = source_vertex
+        self.dist_to = dist_to
+        self.edge_to = edge_to
+
+    @classmethod
+    def from_shortest_path(cls, shortest_path: ShortestPath):
+        edge_to = array(vertex_ids_typecode(len(shortest_path.edge_to)), [-1]) * len(shortest_path.edge_to)
+
+        for v_id, edge in enumerate(shortest_path.edge_to):
+            if edge is not None:
+                edge_to[v_id] = edge.from_vertex().id
+
+        return cls(shortest_path.source_vertex, array('d', shortest_path.dist_to), edge_to)
+
+    def _parent_id(self, v_id: int):
+        parent_id = self.edge_to[v_id]
+
+        if parent_id == -1:
+            return None
+
+        return parent_id
+
+    def memory_usage(self):
+        """
+        :return: int: bytes used by the tree
+        """
+        return self.dist_to.itemsize * len(self.dist_to) + self.edge_to.itemsize * len(self.edge_to)
+
+
+class ShortestPathCache:
+    """
+    LRU cache of shortest path trees for the graph.
+    Trees are kept in compact form (CachedShortestPath) until their total size reaches memory budget,
+    then least recently used trees are evicted.
+    Graph version is checked on every request, so all trees are dropped as soon as the graph is changed.
+    """
+    def __init__(self, graph: EdgeWeightedDigraph, memory_budget: int = 64 * 1024 * 1024, solver=DijkstraShortestPath):
+        self.graph = graph
+        self.memory_budget = memory_budget
+        self.solver = solver
+        self.trees = OrderedDict()
+        self.graph_version = graph.version
+        self.used_memory = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, source_vertex: Vertex):
+        """
+        Get shortest path tree from source vertex, compute it if there is no valid tree in cache
+        :param source_vertex: source of shortest paths
+        :return: CachedShortestPath object
+        """
+        if self.graph.version != self.graph_version:
+            self.invalidations += 1
+            self.clear()
+            self.graph_version = self.graph.version
+
+        tree = self.trees.get(source_vertex.id)
+
+        if tree is not None:
+            self.hits += 1
+            self.trees.move_to_end(source_vertex.id)
+            return tree
+
+        self.misses += 1
+        tree = CachedShortestPath.from_shortest_path(self.solver(self.graph, source_vertex))
+
+        if tree.memory_usage() <= self.memory_budget:
+            self.trees[source_vertex.id] = tree
+            self.used_memory += tree.memory_usage()
+            self._evict()
+
+        return tree
+
+    def shortest_path(self, source_vertex: Vertex, destination_vertex: Vertex):
+        return self.get(source_vertex).shortest_path_to(destination_vertex)
+
+    def clear(self):
+        self.trees.clear()
+        self.used_memory = 0
+
+    def statistics(self):
+        """
+        :return: dict with counters of the cache
+        """
+        requests = self.hits + self.misses
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests if requests else 0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'trees': len(self.trees),
+            'used_memory': self.used_memory,
+            'memory_budget': self.memory_budget,
+        }
+
+    def _evict(self):
+        while self.used_memory > self.memory_budget:
+            _, tree = self.trees.popitem(last=False)
+            self.used_memory -= tree.memory_usage()
+            self.evictions += 1
+
+
+if __name__ == '__main__':
+    import time
+    from random import randint, random
+
+    from education_part.graphs import Diedge
+
+    size = 2_000
+    g = EdgeWeightedDigraph(size)
+    for _ in range(size * 4):
+        g.add_edge(Diedge(g.vertexes[randint(0, size - 1)], g.vertexes[randint(0, size - 1)], random()))
+
+    # Memory for 10 trees only, while queries go from 20 popular sources
+    cache = ShortestPathCache(g, memory_budget=10 * size * 12)
+    popular_sources = [g.vertexes[randint(0, size - 1)] for _ in range(20)]
+
+    start = time.time()
+    for _ in range(500):
+        source = popular_sources[min(randint(0, 19), randint(0, 19))]
+        cache.shortest_path(source, g.vertexes[randint(0, size - 1)])
+    print(f'500 queries:'.ljust(30), f'{round(time.time() - start, 5)} seconds')
+    print(cache.statistics())
+
+    g.add_edge(Diedge(g.vertexes[0], g.vertexes[1], 0.5))
+    cache.shortest_path(popular_sources[0], g.vertexes[1])
+    print(f'After graph change: {cache.statistics()}')
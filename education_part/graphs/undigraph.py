@@ -1,11 +1,14 @@
-from education_part.graphs import Graph, Vertex
+from education_part.graphs import Graph, Vertex, check_vertex_id, check_vertex_ids, depth_first_walk, PREORDER
 
 
 class Undigraph(Graph):
+    directed = False
+
     def __init__(self, vertex_num):
         self.vertexes_number = vertex_num
         self.vertexes = [Vertex(v_id) for v_id in range(vertex_num)]
         self.edges_number = 0
+        self._start_degree_statistics()
 
     def __repr__(self):
         str_repr = ''
@@ -17,40 +20,76 @@ class Undigraph(Graph):
         return str_repr
 
     def add_edge(self, id_1: int, id_2: int):
-        if id_1 > self.vertexes_number:
-            raise IndexError(id_1)
-        if id_2 > self.vertexes_number:
-            raise IndexError(id_2)
+        check_vertex_id(id_1, self.vertexes_number)
+        check_vertex_id(id_2, self.vertexes_number)
+
+        changed = (id_1, id_2) if id_1 != id_2 else (id_1,)
+        self._degrees_changing(changed)
 
         self.edges_number += 1
         self.vertexes[id_1].adjacencies.append(id_2)
 
         if id_1 != id_2:
             self.vertexes[id_2].adjacencies.append(id_1)
+        else:
+            self._self_loops_number += 1
+
+        self._degrees_changed(changed)
+
+    def add_edges(self, ids_1, ids_2):
+        """
+        Add many edges at once
+        :param ids_1: sequence of ids of first vertexes of edges
+        :param ids_2: sequence of ids of second vertexes of edges
+        :return: None
+        """
+        if len(ids_1) != len(ids_2):
+            raise ValueError('ids_1 and ids_2 have different lengths')
+
+        check_vertex_ids(ids_1, self.vertexes_number)
+        check_vertex_ids(ids_2, self.vertexes_number)
+
+        changed = set(ids_1)
+        changed.update(ids_2)
+        self._degrees_changing(changed)
+
+        vertexes = self.vertexes
+        for id_1, id_2 in zip(ids_1, ids_2):
+            vertexes[id_1].adjacencies.append(id_2)
+
+            if id_1 != id_2:
+                vertexes[id_2].adjacencies.append(id_1)
+            else:
+                self._self_loops_number += 1
+
+        self.edges_number += len(ids_1)
+        self._degrees_changed(changed)
+
+    def degree_histogram(self):
+        return list(self._degree_histogram)
+
+    def self_loops_number(self):
+        return self._self_loops_number
 
 
 class ConnectedComponents:
     def __init__(self, graph: Graph):
         self.graph = graph
-        self.marked = [False for _ in range(len(graph.vertexes))]
-        self.component_id = [None for _ in range(len(graph.vertexes))]
+        self.marked = [False for _ in range(graph.vertexes_number)]
+        self.component_id = [None for _ in range(graph.vertexes_number)]
         self.components_count = 0
 
         self.__connected_components()
 
     def __connected_components(self):
-        for vertex in self.graph.vertexes:
-            if not self.marked[vertex.id]:
-                self.__depth_first_paths(vertex.id)
+        for vertex_id in range(self.graph.vertexes_number):
+            if not self.marked[vertex_id]:
+                self.__depth_first_paths(vertex_id)
                 self.components_count += 1
 
     def __depth_first_paths(self, vertex_id):
-        self.marked[vertex_id] = True
-        self.component_id[vertex_id] = self.components_count
-
-        for adj in self.graph.vertexes[vertex_id].adjacencies:
-            if not self.marked[adj]:
-                self.__depth_first_paths(adj)
+        for event, adj, _ in depth_first_walk(self.graph.adjacencies, vertex_id, self.marked):
+            if event == PREORDER:
                 self.component_id[adj] = self.components_count
 
     def components_number(self):
@@ -79,6 +118,8 @@ if __name__ == '__main__':
     print(f'Max graphs degree: {TypicalGraphProcessing.max_degree(g)}')
     print(f'Average graphs degree: {TypicalGraphProcessing.average_degree(g)}')
     print(f'Number of self loops: {TypicalGraphProcessing.self_loops_number(g)}')
+    print(f'Degree histogram: {TypicalGraphProcessing.degree_histogram(g)}')
+    print(f'90th percentile of degrees: {TypicalGraphProcessing.degree_percentile(g, 90)}')
     print(f'Adjacencies of vertex 12: {TypicalGraphProcessing.vertex_adjacencies(g, 12)}')
     print(f'Degree of vertex 12: {TypicalGraphProcessing.vertex_degree(g, 12)}')
 
@@ -124,3 +165,73 @@ if __name__ == '__main__':
     # print(bfs_2.marked)
     # print(bfs_2.edge_to)
     # print(bfs_2.dist_to_root)
+
+    # Deep graphs: recursive realisation fails here with RecursionError
+    print('\n--- Depth first search on deep graphs ---')
+    import time
+
+    chain_size = 200_000
+    chain = Undigraph(chain_size)
+    for i in range(chain_size - 1):
+        chain.add_edge(i, i + 1)
+
+    grid_side = 400
+    grid = Undigraph(grid_side * grid_side)
+    for row in range(grid_side):
+        for col in range(grid_side):
+            if col + 1 < grid_side:
+                grid.add_edge(row * grid_side + col, row * grid_side + col + 1)
+            if row + 1 < grid_side:
+                grid.add_edge(row * grid_side + col, (row + 1) * grid_side + col)
+
+    for name, deep_graph in (('chain', chain), ('grid', grid)):
+        start = time.time()
+        DepthFirstSearch(deep_graph, 0)
+        print(f'DepthFirstSearch on {name} of {deep_graph.vertexes_number} vertexes:'.ljust(60), end='')
+        print(f' {round(time.time() - start, 5)} seconds')
+
+        start = time.time()
+        ConnectedComponents(deep_graph)
+        print(f'ConnectedComponents on {name} of {deep_graph.vertexes_number} vertexes:'.ljust(60), end='')
+        print(f' {round(time.time() - start, 5)} seconds')
+
+    print('\n--- Paths to every vertex ---')
+    small_grid_side = 100
+    small_grid = Undigraph(small_grid_side * small_grid_side)
+    for row in range(small_grid_side):
+        for col in range(small_grid_side):
+            if col + 1 < small_grid_side:
+                small_grid.add_edge(row * small_grid_side + col, row * small_grid_side + col + 1)
+            if row + 1 < small_grid_side:
+                small_grid.add_edge(row * small_grid_side + col, (row + 1) * small_grid_side + col)
+
+    bfs = BreadthFirstSearch(small_grid, 0)
+    all_ids = range(small_grid.vertexes_number)
+
+    start = time.time()
+    paths = [bfs.path_to(v_id) for v_id in all_ids]
+    print(f'path_to for every vertex, longest path {max(map(len, paths))}:'.ljust(60), end='')
+    print(f' {round(time.time() - start, 5)} seconds')
+
+    start = time.time()
+    shared_paths = bfs.paths_to(all_ids)
+    print(f'paths_to for all vertexes at once:'.ljust(60), f'{round(time.time() - start, 5)} seconds')
+
+    start = time.time()
+    parent, depth = bfs.search_tree()
+    print(f'search_tree, max depth {max(depth)}:'.ljust(60), f'{round(time.time() - start, 5)} seconds')
+
+    if paths != [shared_paths[v_id] for v_id in all_ids]:
+        print('Paths are different!!!')
+
+    print('\n--- Degree statistics ---')
+    start = time.time()
+    Graph.degree_histogram(grid)
+    print(f'Degree histogram by scan of {grid.vertexes_number} vertexes:'.ljust(60), end='')
+    print(f' {round(time.time() - start, 5)} seconds')
+
+    start = time.time()
+    max_degree = TypicalGraphProcessing.max_degree(grid)
+    percentile = TypicalGraphProcessing.degree_percentile(grid, 99)
+    print(f'Max degree {max_degree}, 99th percentile {percentile} from maintained histogram:'.ljust(60), end='')
+    print(f' {round(time.time() - start, 5)} seconds')
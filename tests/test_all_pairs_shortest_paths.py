@@ -0,0 +1,37 @@
+import math
+import os
+import tempfile
+import unittest
+
+from education_part.graphs import (
+    AllPairsShortestPaths, edge_weight_digraph_from_data, EdgeWeightedDigraph, FLOYD_WARSHALL, DIJKSTRA,
+)
+
+
+class AllPairsShortestPathsTest(unittest.TestCase):
+    def setUp(self):
+        g_data = ['4', '0 1 1.0', '1 2 2.0', '0 2 5.0', '2 0 1.5']
+        self.graph = edge_weight_digraph_from_data(g_data, EdgeWeightedDigraph)
+
+    def test_distances(self):
+        for algorithm in (FLOYD_WARSHALL, DIJKSTRA):
+            with AllPairsShortestPaths(self.graph, algorithm=algorithm) as apsp:
+                self.assertEqual(apsp.distance(0, 2), 3.0)
+                self.assertEqual(list(apsp.distances_from(2)), [1.5, 2.5, 0.0, math.inf])
+
+    def test_row_kept_across_close(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'matrix.bin')
+
+            with AllPairsShortestPaths(self.graph, path=path) as apsp:
+                row = apsp.distances_from(0)
+
+            with AllPairsShortestPaths.load(path) as loaded:
+                loaded_row = loaded.distances_from(0)
+
+        self.assertEqual(list(row), [0.0, 1.0, 3.0, math.inf])
+        self.assertEqual(loaded_row, row)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from array import array
+from multiprocessing import shared_memory
+
+from education_part.graphs import CSRGraph, dijkstra_distances, many_source_shortest_paths
+
+
+def _cycle_graph(size: int):
+    return CSRGraph(
+        vertex_num=size,
+        offsets=array('q', range(size + 1)),
+        targets=array('i', [(v_id + 1) % size for v_id in range(size)]),
+        edges_number=size,
+        weights=array('d', [1.0] * size),
+    )
+
+
+class ManySourceShortestPathsTest(unittest.TestCase):
+    def assertUnlinked(self, name: str):
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+    def test_distances(self):
+        graph = _cycle_graph(10)
+
+        with many_source_shortest_paths(graph, range(10), processes=2) as results:
+            for source_id, dist_to in results:
+                self.assertEqual(dist_to, dijkstra_distances(graph, source_id))
+
+    def test_break_in_context_manager_unlinks_shared_memory(self):
+        with many_source_shortest_paths(_cycle_graph(10), range(10), processes=2) as results:
+            name = results.shared.shared_memory.name
+            for _ in results:
+                break
+
+        self.assertUnlinked(name)
+
+    def test_close_after_early_stop_unlinks_shared_memory(self):
+        results = many_source_shortest_paths(_cycle_graph(10), range(10), processes=2)
+        name = results.shared.shared_memory.name
+        next(results)
+        results.close()
+
+        self.assertUnlinked(name)
+        self.assertEqual(list(results), [])
+
+    def test_exhausted_iteration_unlinks_shared_memory(self):
+        results = many_source_shortest_paths(_cycle_graph(10), range(10), processes=2)
+        name = results.shared.shared_memory.name
+
+        self.assertEqual(len(list(results)), 10)
+        self.assertUnlinked(name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import tracemalloc
+import unittest
+
+from education_part.graphs import tree_paths
+
+
+class TreePathsTest(unittest.TestCase):
+    def test_paths_to_many_vertexes(self):
+        parent = [None, 0, 1, 1, 3, None]
+
+        paths = tree_paths(parent.__getitem__, 0, [4, 2, 0, 5, 3, 4])
+
+        self.assertEqual(paths, {4: [0, 1, 3, 4], 2: [0, 1, 2], 0: [0], 5: None, 3: [0, 1, 3]})
+
+    def test_deep_vertex_costs_linear(self):
+        length = 20_000
+        parent = [None] + list(range(length - 1))
+        calls = 0
+
+        def parent_id(v_id):
+            nonlocal calls
+            calls += 1
+            return parent[v_id]
+
+        tracemalloc.start()
+        paths = tree_paths(parent_id, 0, [length - 1])
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        self.assertEqual(paths[length - 1], list(range(length)))
+        self.assertLessEqual(calls, 2 * length)
+        self.assertLess(peak, 200 * length)  # one path and a few sets, not a prefix per vertex
+
+
+if __name__ == '__main__':
+    unittest.main()